@@ -0,0 +1,32 @@
+"""
+자동 crop 용 내용 영역(bounding box) 탐색
+"""
+
+import numpy as np
+
+
+def content_bbox(pixels: np.ndarray, background: int, chunk_rows=1024):
+    """
+    background 가 아닌 픽셀을 모두 포함하는 최소 사각형
+    반환: (left, top, right, bottom) - right/bottom 은 exclusive. 내용이 없으면 None
+    행 청크 단위로 any() 축소를 해서 전체 크기 bool 배열을 만들지 않는다.
+    """
+    h, w = pixels.shape
+    cols_any = np.zeros(w, dtype=bool)
+    top = bottom = None
+
+    for r0 in range(0, h, chunk_rows):
+        mask = pixels[r0 : r0 + chunk_rows] != background
+        rows_any = mask.any(axis=1)
+        if not rows_any.any():
+            continue
+        cols_any |= mask.any(axis=0)
+        hit = np.flatnonzero(rows_any)
+        if top is None:
+            top = r0 + int(hit[0])
+        bottom = r0 + int(hit[-1]) + 1
+
+    if top is None:
+        return None
+    hit = np.flatnonzero(cols_any)
+    return int(hit[0]), top, int(hit[-1]) + 1, bottom
@@ -0,0 +1,130 @@
+"""
+맵 전체 연산용 병렬 필터 실행기
+
+이미지를 가로 띠(band) 로 나눠 스레드 풀(기본) 또는 프로세스 풀에서 처리한다.
+- 스레드: 워커가 같은 numpy 버퍼를 직접 공유 (numpy 연산은 대부분 GIL 을 놓는다)
+- 프로세스: src/dst 를 multiprocessing.shared_memory 에 올려 복사 없이 공유.
+  이 경우 filter 함수는 pickle 가능한 모듈 최상위 함수여야 한다.
+
+filter 함수 규약: func(band) -> band 와 같은 shape 의 배열
+이웃 픽셀이 필요한 필터는 halo 를 주면 위/아래로 halo 행을 덧붙인 band 를 받고,
+결과에서 halo 부분은 버려진다. 좌우는 band 가 전체 폭이므로 필요 없다.
+"""
+
+import os
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import palette
+
+
+def _band_ranges(height: int, band_rows: int):
+    return [(r0, min(height, r0 + band_rows)) for r0 in range(0, height, band_rows)]
+
+
+def _apply_band(func, src, dst, r0, r1, halo):
+    h = src.shape[0]
+    s0, s1 = max(0, r0 - halo), min(h, r1 + halo)
+    out = func(src[s0:s1])
+    dst[r0:r1] = out[r0 - s0 : r0 - s0 + (r1 - r0)]
+
+
+def _process_band(func, src_spec, dst_spec, r0, r1, halo):
+    """프로세스 워커: 공유 메모리에 붙어서 band 하나 처리"""
+    src_shm = shared_memory.SharedMemory(name=src_spec[0])
+    dst_shm = shared_memory.SharedMemory(name=dst_spec[0])
+    try:
+        src = np.ndarray(src_spec[1], dtype=src_spec[2], buffer=src_shm.buf)
+        dst = np.ndarray(dst_spec[1], dtype=dst_spec[2], buffer=dst_shm.buf)
+        _apply_band(func, src, dst, r0, r1, halo)
+        del src, dst
+    finally:
+        src_shm.close()
+        dst_shm.close()
+
+
+class FilterExecutor:
+    def __init__(self, workers=None, band_rows=256, use_processes=False):
+        self.workers = workers or os.cpu_count() or 1
+        self.band_rows = max(1, int(band_rows))
+        self.use_processes = use_processes
+
+    def run(self, func, src: np.ndarray, dst: np.ndarray = None, halo=0, progress=None):
+        """
+        func 를 src 전체에 적용해서 dst 에 기록 (dst 생략 시 새 배열)
+        progress: progress(done_bands, total_bands) - 호출한 스레드에서 불림
+        """
+        if dst is None:
+            dst = np.empty_like(src)
+        if halo > 0 and np.shares_memory(src, dst):
+            # 제자리 연산이면 이웃 행이 먼저 덮어써지지 않도록 원본 보존
+            src = src.copy()
+
+        bands = _band_ranges(src.shape[0], self.band_rows)
+        total = len(bands)
+        if self.workers <= 1 or total <= 1:
+            for i, (r0, r1) in enumerate(bands):
+                _apply_band(func, src, dst, r0, r1, halo)
+                if progress:
+                    progress(i + 1, total)
+            return dst
+
+        if self.use_processes:
+            self._run_processes(func, src, dst, bands, halo, progress)
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [
+                    pool.submit(_apply_band, func, src, dst, r0, r1, halo)
+                    for r0, r1 in bands
+                ]
+                self._wait(futures, progress)
+        return dst
+
+    def _run_processes(self, func, src, dst, bands, halo, progress):
+        src_shm = shared_memory.SharedMemory(create=True, size=max(1, src.nbytes))
+        dst_shm = shared_memory.SharedMemory(create=True, size=max(1, dst.nbytes))
+        try:
+            shared_src = np.ndarray(src.shape, dtype=src.dtype, buffer=src_shm.buf)
+            shared_src[:] = src
+            src_spec = (src_shm.name, src.shape, src.dtype.str)
+            dst_spec = (dst_shm.name, dst.shape, dst.dtype.str)
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [
+                    pool.submit(_process_band, func, src_spec, dst_spec, r0, r1, halo)
+                    for r0, r1 in bands
+                ]
+                self._wait(futures, progress)
+            dst[:] = np.ndarray(dst.shape, dtype=dst.dtype, buffer=dst_shm.buf)
+            del shared_src
+        finally:
+            src_shm.close()
+            src_shm.unlink()
+            dst_shm.close()
+            dst_shm.unlink()
+
+    @staticmethod
+    def _wait(futures, progress):
+        total = len(futures)
+        for done, future in enumerate(as_completed(futures), start=1):
+            future.result()
+            if progress:
+                progress(done, total)
+
+
+# -----------------------
+#    픽셀 단위 필터
+# -----------------------
+def invert_rgb(band):
+    """QImage.InvertRgb 와 동일 (alpha 유지)"""
+    return band ^ np.uint32(0x00FFFFFF)
+
+
+def highlight_inside(band):
+    """inside(#010101) 픽셀을 하이라이트 색으로"""
+    return np.where(band == palette.INSIDE, np.uint32(palette.HIGHLIGHT), band)
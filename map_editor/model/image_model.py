@@ -1,6 +1,18 @@
-from PyQt5.QtGui import QImage, QPainter, QColor, QPen, QTransform
-from PyQt5.QtCore import Qt
-from .map_metadata import MapMetadata
+import numpy as np
+from PyQt5.QtGui import QImage, QColor, QTransform
+from PyQt5.QtCore import QRect
+from .map_metadata import MapMetadata, MapMetadataError
+from .pixel_buffer import ensure_argb32, image_from_array, image_view, new_image
+from .resample import resample_into, resampled_size
+from .crop import content_bbox
+from .filters import FilterExecutor
+from .occupancy import classify_image
+from .tiles import changed_tiles, tile_rect
+from .selection import FloatingSelection
+from .project_file import ProjectFormatError, ProjectReader, save_project
+from .path_planning import PathPlanner
+from .lidar import beam_angles, cast_rays
+from . import filters, merge, morphology, palette, rasterizer
 
 
 class ImageModel:
@@ -15,28 +27,290 @@ class ImageModel:
         self._undo_stack = []
         self._metadata = MapMetadata()
 
-    def _push_undo(self):
-        """현재 baseline 이미지를 undo 스택에 복사해서 저장 (작업 전 호출)"""
+        # 현재 맵을 불러온 경로 (이미지, YAML) - follow file 모드에서 사용
+        self._source = (None, None)
+
+        # 맵 전체 연산용 병렬 실행기 / 진행률 콜백 progress(done, total)
+        self._filter_executor = FilterExecutor()
+        self._progress_callback = None
+
+        # 편집/로드 때마다 증가 - 맵 내용 기준 캐시(경로 탐색 등) 무효화용
+        self._revision = 0
+        self._path_planner = PathPlanner(self._filter_executor)
+
+    def set_progress_callback(self, callback):
+        self._progress_callback = callback
+
+    def _run_filter(self, func, src, dst=None, halo=0):
+        """맵 전체 연산을 band 단위 병렬 실행"""
+        return self._filter_executor.run(
+            func, src, dst, halo=halo, progress=self._progress_callback
+        )
+
+    def _push_undo(self, with_metadata=False):
+        """
+        현재 baseline 이미지를 undo 스택에 복사해서 저장 (작업 전 호출)
+        with_metadata: 메타데이터(resolution/origin)도 바꾸는 작업이면 True
+        """
+        self._revision += 1
         if not self._baseline_image.isNull():
-            self._undo_stack.append(self._baseline_image.copy())
+            meta_state = self._metadata.snapshot() if with_metadata else None
+            self._undo_stack.append((self._baseline_image.copy(), meta_state, None))
+
+    def _push_undo_region(self, rect: QRect, with_metadata=False):
+        """rect 영역만 잘라서 undo 스택에 저장 (이미지 크기가 바뀌지 않는 작업용)"""
+        self._push_undo_regions([rect], with_metadata)
+
+    def _push_undo_regions(self, rects, with_metadata=False):
+        """여러 영역을 undo 1개로 저장 (예: 선택 영역 이동의 원래 자리 + 새 자리)"""
+        self._revision += 1
+        if not self._baseline_image.isNull():
+            meta_state = self._metadata.snapshot() if with_metadata else None
+            patches = [
+                (rect.x(), rect.y(), self._baseline_image.copy(rect))
+                for rect in rects
+                if not rect.isEmpty()
+            ]
+            self._undo_stack.append((None, meta_state, patches))
 
     def undo(self):
         """스택에서 마지막 이미지를 가져와 baseline으로 되돌림"""
         if self._undo_stack:
-            prev_img = self._undo_stack.pop()
-            self._baseline_image = prev_img
+            self._revision += 1
+            prev_img, meta_state, patches = self._undo_stack.pop()
+            if prev_img is not None:
+                self._baseline_image = prev_img
+                dirty = None
+            else:
+                # 부분 패치: 저장해둔 영역만 (저장 역순으로) 되돌림
+                pixels = image_view(self._baseline_image)
+                dirty = QRect()
+                for x, y, patch in reversed(patches):
+                    h, w = patch.height(), patch.width()
+                    pixels[y : y + h, x : x + w] = image_view(ensure_argb32(patch))
+                    dirty = dirty.united(QRect(x, y, w, h))
+            if meta_state is not None:
+                self._metadata.restore(meta_state)
             if self._highlight_enabled:
-                self._rebuild_highlight_image()
+                self._rebuild_highlight_image(dirty)
 
     def load_image(self, path: str) -> bool:
         new_img = QImage()
         loaded = new_img.load(path)
         if loaded:
             self._undo_stack.clear()
-            self._baseline_image = new_img
+            self._revision += 1
+            self._baseline_image = ensure_argb32(new_img)
+            self._source = (path, None)
             self._rebuild_highlight_image()
         return loaded
 
+    def import_occupancy_grid(self, yaml_path: str, image_path: str = None):
+        """
+        map YAML 의 occupied_thresh/free_thresh/negate 로 원본 grayscale 맵을
+        3색 팔레트로 변환해서 불러옴
+        반환: 클래스별 픽셀 수 dict (실패 시 None)
+        """
+        # 이미지를 불러오기 전까지 현재 메타데이터는 그대로 둠
+        meta = MapMetadata()
+        try:
+            meta.load_from_yaml(yaml_path)
+        except (OSError, MapMetadataError):
+            return None
+        image_path = image_path or meta.image_path
+        if not image_path:
+            return None
+        src = QImage()
+        if not src.load(image_path):
+            return None
+
+        img, histogram = classify_image(
+            src, meta.occupied_thresh, meta.free_thresh, meta.negate
+        )
+        self._undo_stack.clear()
+        self._revision += 1
+        self._baseline_image = img
+        self._source = (image_path, yaml_path)
+        meta.image_path = image_path
+        self._metadata.update_from(meta)
+        self._metadata.set_image_height(img.height())
+        self._rebuild_highlight_image()
+        return histogram
+
+    def merge_maps(self, yaml_paths, out_yaml: str, rule="obstacle"):
+        """
+        여러 맵을 origin 기준으로 합쳐 out_yaml (+ .pgm) 으로 저장 (현재 맵은 그대로)
+        반환: 결과 MapMetadata (실패 시 None)
+        """
+        try:
+            return merge.merge_maps(
+                yaml_paths, out_yaml, rule, progress=self._progress_callback
+            )
+        except (OSError, merge.MapMergeError):
+            return None
+
+    # -----------------------
+    #    파일 따라가기 (follow file)
+    # -----------------------
+    def get_source_paths(self):
+        """현재 맵을 불러온 (이미지 경로, YAML 경로 또는 None)"""
+        return self._source
+
+    def read_source(self, source=None):
+        """
+        맵 파일을 다시 읽어서 (QImage, MapMetadata 또는 None) 반환
+        source: get_source_paths() 결과 (생략 시 현재 맵)
+        모델 상태를 건드리지 않으므로 백그라운드 스레드에서 호출 가능
+        """
+        image_path, yaml_path = source or self._source
+        if not image_path:
+            return None, None
+        src = QImage()
+        if not src.load(image_path):
+            return None, None
+        if yaml_path is None:
+            return ensure_argb32(src), None
+
+        meta = MapMetadata()
+        meta.load_from_yaml(yaml_path)
+        img, _ = classify_image(
+            src, meta.occupied_thresh, meta.free_thresh, meta.negate
+        )
+        return img, meta
+
+    def apply_reload(self, img: QImage, meta: MapMetadata = None):
+        """
+        다시 읽은 이미지를 현재 이미지와 타일 단위로 비교해서 바뀐 타일만 교체
+        undo 기록은 유지되고, 변경분은 undo 1개로 쌓인다.
+        반환: 바뀐 영역 QRect 목록 (이미지 크기가 바뀌어 전체 교체했으면 None)
+        """
+        img = ensure_argb32(img)
+
+        if self._baseline_image.isNull() or self._baseline_image.size() != img.size():
+            self._push_undo(with_metadata=meta is not None)
+            if meta is not None:
+                self._metadata.update_from(meta)
+            self._baseline_image = img
+            self._metadata.set_image_height(img.height())
+            self._rebuild_highlight_image()
+            return None
+
+        old = image_view(self._baseline_image)
+        new = image_view(img)
+        w, h = img.width(), img.height()
+        rects = [QRect(*tile_rect(tx, ty, w, h)) for tx, ty in changed_tiles(old, new)]
+        # origin/resolution 이 바뀌었으면 undo 로 되돌릴 수 있게 같이 저장
+        meta_changed = meta is not None and (
+            list(meta.origin or []) != list(self._metadata.origin or [])
+            or meta.resolution != self._metadata.resolution
+        )
+        bounds = QRect()
+        for rect in rects:
+            bounds = bounds.united(rect)
+        if rects or meta_changed:
+            self._push_undo_regions([bounds], with_metadata=meta_changed)
+        if meta is not None:
+            self._metadata.update_from(meta)
+        if not rects:
+            return []
+
+        for rect in rects:
+            x, y = rect.x(), rect.y()
+            ys, xs = slice(y, y + rect.height()), slice(x, x + rect.width())
+            old[ys, xs] = new[ys, xs]
+            if self._highlight_enabled:
+                self._rebuild_highlight_image(rect)
+        return rects
+
+    # -----------------------
+    #    프로젝트 파일 (.mapproj)
+    # -----------------------
+    def save_project(self, path: str, history_limit: int = 20) -> bool:
+        """픽셀 + 메타데이터 + overlay 설정 + 최근 undo 기록을 한 파일로 저장"""
+        if self._baseline_image.isNull():
+            return False
+        self._baseline_image = ensure_argb32(self._baseline_image)
+
+        history = []
+        recent = self._undo_stack[-history_limit:] if history_limit > 0 else []
+        for full_img, meta_state, patches in recent:
+            if full_img is not None:
+                arrays = [(0, 0, image_view(ensure_argb32(full_img)))]
+            else:
+                arrays = [(x, y, image_view(ensure_argb32(p))) for x, y, p in patches]
+            history.append((meta_state, full_img is not None, arrays))
+
+        try:
+            save_project(
+                path,
+                image_view(self._baseline_image),
+                metadata_yaml=self._metadata.to_yaml_text(),
+                overlays={
+                    "highlight": self._highlight_enabled,
+                    "show_origin": self._show_origin,
+                    "show_coords": self._show_coords,
+                },
+                history=history,
+            )
+        except (OSError, ProjectFormatError):
+            return False
+        return True
+
+    def load_project(self, path: str, rect: QRect = None) -> bool:
+        """
+        프로젝트 파일 불러오기
+        rect 를 주면 해당 영역 타일만 읽어서 잘라 불러옴 (이 경우 undo 기록은 제외)
+        """
+        # 깨진 파일이면 지금 상태를 건드리지 않고 실패만 반환
+        meta = MapMetadata()
+        try:
+            with ProjectReader(path) as reader:
+                full = QRect(0, 0, reader.width, reader.height)
+                rect = full if rect is None else rect.intersected(full)
+                if rect.isEmpty():
+                    return False
+                img = new_image(rect.width(), rect.height())
+                reader.read_region(
+                    rect.x(),
+                    rect.y(),
+                    rect.width(),
+                    rect.height(),
+                    out=image_view(img),
+                )
+                history = reader.read_history() if rect == full else []
+                overlays = reader.overlays
+                if reader.metadata_yaml:
+                    meta.load_from_yaml_text(reader.metadata_yaml)
+        except (OSError, ProjectFormatError, MapMetadataError):
+            return False
+
+        self._metadata.update_from(meta)
+        self._metadata.set_image_height(reader.height)
+        if rect != full:
+            bottom = reader.height - (rect.y() + rect.height())
+            self._metadata.apply_offset(rect.x(), bottom, rect.height())
+
+        self._undo_stack.clear()
+        for meta_state, is_full, patches in history:
+            if is_full:
+                self._undo_stack.append(
+                    (image_from_array(patches[0][2]), meta_state, None)
+                )
+            else:
+                qpatches = [(x, y, image_from_array(a)) for x, y, a in patches]
+                self._undo_stack.append((None, meta_state, qpatches))
+
+        self._revision += 1
+        self._baseline_image = img
+        self._source = (None, None)
+        self._highlight_enabled = bool(overlays.get("highlight", False))
+        self._show_origin = bool(overlays.get("show_origin", False))
+        self._show_coords = bool(overlays.get("show_coords", False))
+        self._highlighted_image = QImage()
+        if self._highlight_enabled:
+            self._rebuild_highlight_image()
+        return True
+
     def save_image(self, path: str) -> bool:
         if self._baseline_image.isNull():
             return False
@@ -45,65 +319,55 @@ class ImageModel:
     def invert_colors(self):
         if not self._baseline_image.isNull():
             self._push_undo()
-            self._baseline_image.invertPixels(QImage.InvertRgb)
+            self._baseline_image = ensure_argb32(self._baseline_image)
+            pixels = image_view(self._baseline_image)
+            self._run_filter(filters.invert_rgb, pixels, pixels)
             self._rebuild_highlight_image()
 
     def draw_brush(
         self, x, y, color: QColor, brush_size: int, prev_x=None, prev_y=None
     ):
         """브러시로 자유 드로잉 (사각형 캡)"""
-        if self._baseline_image.isNull():
-            return
-        self._push_undo()
-
-        painter = QPainter(self._baseline_image)
-        pen = QPen(color, brush_size, Qt.SolidLine, Qt.SquareCap, Qt.MiterJoin)
-        painter.setPen(pen)
-
         if (prev_x is not None) and (prev_y is not None):
-            painter.drawLine(int(prev_x), int(prev_y), int(x), int(y))
+            points = [(prev_x, prev_y), (x, y)]
         else:
-            painter.drawPoint(int(x), int(y))
-        painter.end()
-
-        if self._highlight_enabled:
-            self._rebuild_highlight_image()
+            points = [(x, y)]
+        return self.draw_polyline(points, color, brush_size)
 
     def draw_line(self, x1, y1, x2, y2, color: QColor, thickness: int):
         """시작점→끝점 직선"""
-        if self._baseline_image.isNull():
-            return
-        self._push_undo()
+        return self.draw_polyline([(x1, y1), (x2, y2)], color, thickness)
 
-        painter = QPainter(self._baseline_image)
-        pen = QPen(color, thickness, Qt.SolidLine, Qt.SquareCap, Qt.MiterJoin)
-        painter.setPen(pen)
-        painter.drawLine(int(x1), int(y1), int(x2), int(y2))
-        painter.end()
-
-        if self._highlight_enabled:
-            self._rebuild_highlight_image()
+    def draw_polyline(self, points, color: QColor, thickness: int):
+        """여러 점을 잇는 선을 한 번에 그림 (undo 1개)"""
+        return self._rasterize(rasterizer.polyline_spans(points, thickness), color)
 
     def fill_rect_area(self, x1, y1, x2, y2, color: QColor):
         """사각형 영역 내부를 지정 색으로 채우기"""
-        if self._baseline_image.isNull():
-            return
-        self._push_undo()
-
-        painter = QPainter(self._baseline_image)
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(color)
+        return self._rasterize(rasterizer.rect_spans(x1, y1, x2, y2), color)
 
-        left = min(int(x1), int(x2))
-        right = max(int(x1), int(x2))
-        top = min(int(y1), int(y2))
-        bottom = max(int(y1), int(y2))
-
-        painter.drawRect(left, top, right - left, bottom - top)
-        painter.end()
+    def _rasterize(self, spans, color: QColor) -> QRect:
+        """
+        span 배치를 baseline 에 기록하고 변경된 영역(dirty rect) 반환
+        undo 에는 변경 영역만 저장
+        """
+        if self._baseline_image.isNull():
+            return QRect()
+        self._baseline_image = ensure_argb32(self._baseline_image)
+        w, h = self._baseline_image.width(), self._baseline_image.height()
+        spans = rasterizer.clip_spans(spans, w, h)
+        bbox = rasterizer.spans_bbox(spans)
+        if bbox is None:
+            return QRect()
+
+        left, top, right, bottom = bbox
+        dirty = QRect(left, top, right - left, bottom - top)
+        self._push_undo_region(dirty)
+        rasterizer.fill_spans(image_view(self._baseline_image), spans, color.rgba())
 
         if self._highlight_enabled:
-            self._rebuild_highlight_image()
+            self._rebuild_highlight_image(dirty)
+        return dirty
 
     # -----------------------
     #    이미지 회전
@@ -130,6 +394,303 @@ class ImageModel:
             if self._highlight_enabled:
                 self._rebuild_highlight_image()
 
+    # -----------------------
+    #    해상도 변환
+    # -----------------------
+    def resample_to_resolution(self, new_resolution: float, current_resolution=None):
+        """
+        맵을 새 해상도(m/px)로 리샘플링하고 메타데이터 갱신
+        current_resolution 을 생략하면 메타데이터의 resolution 사용
+        """
+        if self._baseline_image.isNull() or not new_resolution or new_resolution <= 0:
+            return False
+        if current_resolution is None:
+            current_resolution = self._metadata.resolution
+        if not current_resolution:
+            return False
+
+        scale = current_resolution / new_resolution
+        src_img = ensure_argb32(self._baseline_image)
+        new_w, new_h = resampled_size(src_img.width(), src_img.height(), scale)
+
+        self._push_undo(with_metadata=True)
+        if self._metadata.resolution is None:
+            self._metadata.resolution = current_resolution
+        dst_img = new_image(new_w, new_h)
+        resample_into(image_view(src_img), image_view(dst_img), scale)
+
+        self._baseline_image = dst_img
+        self._metadata.apply_resample(scale, new_h)
+        if self._highlight_enabled:
+            self._rebuild_highlight_image()
+        return True
+
+    # -----------------------
+    #    자동 crop / pad
+    # -----------------------
+    def auto_crop(self, margin: int = 0, background=palette.OUTSIDE):
+        """background 가 아닌 영역만 남기고 잘라냄 (margin 픽셀 여유)"""
+        if self._baseline_image.isNull():
+            return False
+        img = ensure_argb32(self._baseline_image)
+        bbox = content_bbox(image_view(img), background)
+        if bbox is None:
+            return False
+        left, top, right, bottom = bbox
+        margin = max(0, int(margin))
+        return self.crop_to(
+            left - margin, top - margin, right + margin, bottom + margin
+        )
+
+    def crop_to(self, left: int, top: int, right: int, bottom: int):
+        """[left, right) x [top, bottom) 영역으로 자르기 (이미지 범위로 clamp)"""
+        if self._baseline_image.isNull():
+            return False
+        w, h = self._baseline_image.width(), self._baseline_image.height()
+        left, top = max(0, int(left)), max(0, int(top))
+        right, bottom = min(w, int(right)), min(h, int(bottom))
+        if right <= left or bottom <= top:
+            return False
+        if (left, top, right, bottom) == (0, 0, w, h):
+            return False
+
+        self._push_undo(with_metadata=True)
+        rect = QRect(left, top, right - left, bottom - top)
+        self._baseline_image = self._baseline_image.copy(rect)
+        self._metadata.apply_offset(left, h - bottom, bottom - top)
+        if self._highlight_enabled:
+            self._rebuild_highlight_image()
+        return True
+
+    def pad(self, left: int, top: int, right: int, bottom: int, fill=palette.OUTSIDE):
+        """crop 의 역연산: 가장자리에 fill 색 픽셀 추가"""
+        if self._baseline_image.isNull():
+            return False
+        left, top, right, bottom = (max(0, int(v)) for v in (left, top, right, bottom))
+        if left == top == right == bottom == 0:
+            return False
+
+        src = ensure_argb32(self._baseline_image)
+        w, h = src.width(), src.height()
+        self._push_undo(with_metadata=True)
+        dst = new_image(w + left + right, h + top + bottom, fill)
+        image_view(dst)[top : top + h, left : left + w] = image_view(src)
+
+        self._baseline_image = dst
+        self._metadata.apply_offset(-left, -bottom, dst.height())
+        if self._highlight_enabled:
+            self._rebuild_highlight_image()
+        return True
+
+    # -----------------------
+    #    형태학 정리
+    # -----------------------
+    def apply_morphology(
+        self, op: str, class_value: int, size=3, shape="square", rect: QRect = None
+    ) -> QRect:
+        """class_value 클래스에 erode/dilate/open/close (rect 생략 시 전체)"""
+        return self._apply_region_filter(
+            lambda px: morphology.apply_class_morphology(
+                px, op, class_value, size, shape
+            ),
+            rect,
+            halo=2 * int(size),
+        )
+
+    def remove_speckles(self, class_value: int, min_pixels: int, rect: QRect = None):
+        """
+        class_value 클래스 중 min_pixels 미만 크기의 점 잡음 제거
+        rect 를 주면 그 안에 완전히 들어있는 연결 요소만 지운다.
+        """
+        # 연결 요소는 band 경계를 넘어 이어지므로 band 로 나누지 않고 한 번에 라벨링.
+        # rect 밖 1픽셀(halo)까지 라벨링해서 rect 경계를 넘는 요소는 남긴다
+        inner = None
+        if rect is not None and not self._baseline_image.isNull():
+            bounds = self._baseline_image.rect()
+            rect = rect.intersected(bounds)
+            area = rect.adjusted(-1, -1, 1, 1).intersected(bounds)
+            top, left = rect.top() - area.top(), rect.left() - area.left()
+            inner = (
+                slice(top, top + rect.height()),
+                slice(left, left + rect.width()),
+            )
+        return self._apply_region_filter(
+            lambda px: morphology.remove_speckles(px, class_value, min_pixels, inner),
+            rect,
+            halo=1,
+            banded=False,
+        )
+
+    def _apply_region_filter(
+        self, func, rect: QRect = None, halo=0, banded=True
+    ) -> QRect:
+        """
+        rect(+halo) 영역에 func 적용 후 실제로 바뀐 픽셀의 bbox 만
+        undo 1개로 저장하고 기록. 변경 영역 반환
+        banded=False 면 band 로 나누지 않고 영역 전체에 한 번 적용
+        """
+        if self._baseline_image.isNull():
+            return QRect()
+        self._baseline_image = ensure_argb32(self._baseline_image)
+        pixels = image_view(self._baseline_image)
+        h, w = pixels.shape
+        if rect is None:
+            rect = self._baseline_image.rect()
+        rect = rect.intersected(self._baseline_image.rect())
+        if rect.isEmpty():
+            return QRect()
+
+        x0, y0 = rect.left(), rect.top()
+        x1, y1 = x0 + rect.width(), y0 + rect.height()
+        hx0, hy0 = max(0, x0 - halo), max(0, y0 - halo)
+        hx1, hy1 = min(w, x1 + halo), min(h, y1 + halo)
+        region = pixels[hy0:hy1, hx0:hx1]
+        if banded:
+            result = self._run_filter(func, region, halo=halo)
+        else:
+            result = func(region)
+        patch = result[y0 - hy0 : y1 - hy0, x0 - hx0 : x1 - hx0]
+        current = pixels[y0:y1, x0:x1]
+
+        changed = patch != current
+        rows = np.flatnonzero(changed.any(axis=1))
+        if rows.size == 0:
+            return QRect()
+        cols = np.flatnonzero(changed.any(axis=0))
+        top, bottom = int(rows[0]), int(rows[-1]) + 1
+        left, right = int(cols[0]), int(cols[-1]) + 1
+
+        dirty = QRect(x0 + left, y0 + top, right - left, bottom - top)
+        self._push_undo_region(dirty)
+        current[top:bottom, left:right] = patch[top:bottom, left:right]
+        if self._highlight_enabled:
+            self._rebuild_highlight_image(dirty)
+        return dirty
+
+    # -----------------------
+    #    선택 영역 (복사 / 잘라내기 / 붙여넣기 / 이동)
+    # -----------------------
+    def _selection_area(self, rect: QRect, polygon=None):
+        """(이미지 범위로 자른 rect, rect 크기 bool 마스크) - 올가미면 polygon 내부만"""
+        rect = rect.normalized().intersected(self._baseline_image.rect())
+        if rect.isEmpty():
+            return rect, None
+        mask = np.zeros((rect.height(), rect.width()), dtype=bool)
+        if polygon is None:
+            mask[:] = True
+        else:
+            local = [(px - rect.x(), py - rect.y()) for px, py in polygon]
+            spans = rasterizer.clip_spans(
+                rasterizer.polygon_spans(local), rect.width(), rect.height()
+            )
+            rasterizer.fill_spans(mask, spans, True)
+        return rect, mask
+
+    def copy_selection(self, rect: QRect, polygon=None):
+        """선택 영역 복사본을 FloatingSelection 으로 반환 (baseline 은 그대로)"""
+        if self._baseline_image.isNull():
+            return None
+        self._baseline_image = ensure_argb32(self._baseline_image)
+        rect, mask = self._selection_area(rect, polygon)
+        if mask is None or not mask.any():
+            return None
+        x, y, w, h = rect.x(), rect.y(), rect.width(), rect.height()
+        pixels = image_view(self._baseline_image)[y : y + h, x : x + w].copy()
+        return FloatingSelection(pixels, mask, x, y)
+
+    def lift_selection(self, rect: QRect, polygon=None, fill=palette.OUTSIDE):
+        """
+        이동용으로 선택 영역을 띄움
+        commit 전까지 baseline 은 바뀌지 않고, commit 때 원래 자리를 fill 로 비움
+        """
+        floating = self.copy_selection(rect, polygon)
+        if floating is not None:
+            floating.source = (floating.x, floating.y)
+            floating.fill = fill
+        return floating
+
+    def cut_selection(self, rect: QRect, polygon=None, fill=palette.OUTSIDE):
+        """선택 영역을 복사하고 원래 자리를 fill 로 비움 (undo 1개)"""
+        floating = self.copy_selection(rect, polygon)
+        if floating is None:
+            return None
+        dirty = floating.rect()
+        self._push_undo_region(dirty)
+        region = self._region_view(dirty)
+        region[floating.mask] = np.uint32(fill)
+        if self._highlight_enabled:
+            self._rebuild_highlight_image(dirty)
+        return floating
+
+    def commit_selection(self, floating) -> QRect:
+        """떠 있는 선택 영역을 현재 위치에 반영. 원래 자리 + 새 자리만 undo 에 기록"""
+        if self._baseline_image.isNull() or floating is None:
+            return QRect()
+        bounds = self._baseline_image.rect()
+        dest = floating.rect().intersected(bounds)
+        source = floating.source_rect().intersected(bounds)
+        if dest.isEmpty() and source.isEmpty():
+            return QRect()
+
+        self._push_undo_regions([source, dest])
+        if not source.isEmpty():
+            self._region_view(source)[floating.mask] = np.uint32(floating.fill)
+        if not dest.isEmpty():
+            # 이미지 밖으로 나간 부분은 잘라서 기록
+            ox, oy = dest.x() - floating.x, dest.y() - floating.y
+            ys = slice(oy, oy + dest.height())
+            xs = slice(ox, ox + dest.width())
+            mask = floating.mask[ys, xs]
+            self._region_view(dest)[mask] = floating.pixels[ys, xs][mask]
+
+        dirty = source.united(dest)
+        if self._highlight_enabled:
+            self._rebuild_highlight_image(dirty)
+        return dirty
+
+    def _region_view(self, rect: QRect) -> np.ndarray:
+        x, y = rect.x(), rect.y()
+        return image_view(self._baseline_image)[
+            y : y + rect.height(), x : x + rect.width()
+        ]
+
+    # -----------------------
+    #    경로 / 도달 가능 여부 확인
+    # -----------------------
+    def get_revision(self) -> int:
+        return self._revision
+
+    def plan_path(self, start, goal, robot_radius_px=0.0, allow_unknown=False):
+        """
+        start/goal: 픽셀 좌표 (x, y)
+        반환: 경로 [(x, y), ...] (도달 불가면 None)
+        """
+        if self._baseline_image.isNull():
+            return None
+        self._baseline_image = ensure_argb32(self._baseline_image)
+        self._path_planner.prepare(
+            image_view(self._baseline_image),
+            self._revision,
+            robot_radius_px,
+            allow_unknown,
+        )
+        return self._path_planner.find_path(start, goal)
+
+    # -----------------------
+    #    라이다 스캔 시뮬레이션
+    # -----------------------
+    def simulate_scan(self, x, y, heading, max_range_px, fov, beams):
+        """
+        (x, y) 픽셀 위치, heading/fov 는 rad (실좌표 기준 반시계)
+        반환: (빔 각도, 거리[px]) - 장애물에 닿지 않은 빔은 inf
+        """
+        angles = beam_angles(heading, fov, beams)
+        if self._baseline_image.isNull():
+            return angles, np.full(angles.size, np.inf)
+        self._baseline_image = ensure_argb32(self._baseline_image)
+        ranges = cast_rays(image_view(self._baseline_image), x, y, angles, max_range_px)
+        return angles, ranges
+
     def set_highlight_enabled(self, enabled: bool):
         self._highlight_enabled = enabled
         if enabled:
@@ -138,28 +699,35 @@ class ImageModel:
     def is_highlight_enabled(self) -> bool:
         return self._highlight_enabled
 
-    def _rebuild_highlight_image(self):
-        """(1,1,1,255) 픽셀 => (255,0,0,255)로"""
+    def _rebuild_highlight_image(self, rect: QRect = None):
+        """
+        (1,1,1,255) 픽셀 => (255,0,0,255)로
+        rect 가 주어지면 해당 영역만 갱신
+        """
         if self._baseline_image.isNull():
             self._highlighted_image = QImage()
             return
 
-        copy_img = self._baseline_image.copy()
-        w, h = copy_img.width(), copy_img.height()
-
-        for y in range(h):
-            for x in range(w):
-                c = copy_img.pixelColor(x, y)
-                # alpha=255도 체크
-                if (
-                    c.red() == 1
-                    and c.green() == 1
-                    and c.blue() == 1
-                    and c.alpha() == 255
-                ):
-                    copy_img.setPixelColor(x, y, QColor(255, 0, 0, 255))
+        base_img = ensure_argb32(self._baseline_image)
+        if (
+            rect is None
+            or self._highlighted_image.isNull()
+            or self._highlighted_image.size() != base_img.size()
+        ):
+            # 전체 재생성은 병렬 필터로 (다 채운 뒤에 교체)
+            highlighted = new_image(base_img.width(), base_img.height())
+            self._run_filter(
+                filters.highlight_inside, image_view(base_img), image_view(highlighted)
+            )
+            self._highlighted_image = highlighted
+            return
 
-        self._highlighted_image = copy_img
+        y0, y1 = rect.top(), rect.top() + rect.height()
+        x0, x1 = rect.left(), rect.left() + rect.width()
+        src = image_view(base_img)[y0:y1, x0:x1]
+        dst = image_view(self._highlighted_image)[y0:y1, x0:x1]
+        np.copyto(dst, src)
+        dst[src == palette.INSIDE] = palette.HIGHLIGHT
 
     def get_current_image(self) -> QImage:
         if self._highlight_enabled:
@@ -170,8 +738,9 @@ class ImageModel:
     def export_inverted_image(self, path: str) -> bool:
         if self._baseline_image.isNull():
             return False
-        img = self._baseline_image.copy()
-        img.invertPixels(QImage.InvertRgb)
+        src = ensure_argb32(self._baseline_image)
+        img = new_image(src.width(), src.height())
+        self._run_filter(filters.invert_rgb, image_view(src), image_view(img))
         return img.save(path)
 
     def get_metadata(self):
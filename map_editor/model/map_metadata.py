@@ -1,5 +1,15 @@
+import os
+
 import yaml
 
+# ROS map_server 기본값
+DEFAULT_OCCUPIED_THRESH = 0.65
+DEFAULT_FREE_THRESH = 0.196
+
+
+class MapMetadataError(ValueError):
+    """YAML 이 깨졌거나 map_server 형식이 아님"""
+
 
 class MapMetadata:
     def __init__(self):
@@ -7,15 +17,111 @@ class MapMetadata:
         self.resolution = None
         self.image_height = None  # 추후 필요
 
+        # 원본 occupancy grid 해석용 (map YAML)
+        self.image_path = None
+        self.occupied_thresh = DEFAULT_OCCUPIED_THRESH
+        self.free_thresh = DEFAULT_FREE_THRESH
+        self.negate = False
+
     def load_from_yaml(self, path: str):
         with open(path, "r") as f:
-            data = yaml.safe_load(f)
-        self.origin = data.get("origin", [0.0, 0.0, 0.0])
-        self.resolution = data.get("resolution", 1.0)
+            text = f.read()
+        self.load_from_yaml_text(text, os.path.dirname(path))
+
+    def load_from_yaml_text(self, text: str, base_dir: str = ""):
+        """형식이 잘못되면 MapMetadataError (값은 바뀌지 않음)"""
+        try:
+            data = yaml.safe_load(text) or {}
+            loaded = MapMetadata()
+            loaded._load_from_dict(data, base_dir)
+        except (yaml.YAMLError, AttributeError, TypeError, ValueError) as e:
+            raise MapMetadataError(f"invalid map yaml: {e}") from None
+        self.update_from(loaded)
+
+    def to_yaml_text(self, image: str = None) -> str:
+        """map_server 형식 YAML 문자열 (resolution 이 없으면 빈 문자열)"""
+        if self.resolution is None:
+            return ""
+        data = {}
+        if image:
+            data["image"] = image
+        data["resolution"] = float(self.resolution)
+        data["origin"] = [float(v) for v in (self.origin or [0.0, 0.0, 0.0])]
+        data["negate"] = int(self.negate)
+        data["occupied_thresh"] = float(self.occupied_thresh)
+        data["free_thresh"] = float(self.free_thresh)
+        return yaml.safe_dump(data, default_flow_style=None, sort_keys=False)
+
+    def _load_from_dict(self, data: dict, base_dir: str):
+        self.origin = [float(v) for v in data.get("origin", [0.0, 0.0, 0.0])]
+        self.resolution = float(data.get("resolution", 1.0))
+        self.occupied_thresh = float(
+            data.get("occupied_thresh", DEFAULT_OCCUPIED_THRESH)
+        )
+        self.free_thresh = float(data.get("free_thresh", DEFAULT_FREE_THRESH))
+        self.negate = bool(int(data.get("negate", 0)))
+
+        # image 는 YAML 파일 기준 상대 경로일 수 있음
+        image = data.get("image")
+        if image:
+            self.image_path = os.path.join(base_dir, image)
+        else:
+            self.image_path = None
+
+    def update_from(self, other: "MapMetadata"):
+        """다른 MapMetadata 에서 읽어온 YAML 값 복사 (image_height 는 유지)"""
+        self.origin = list(other.origin) if other.origin is not None else None
+        self.resolution = other.resolution
+        self.image_path = other.image_path
+        self.occupied_thresh = other.occupied_thresh
+        self.free_thresh = other.free_thresh
+        self.negate = other.negate
 
     def set_image_height(self, height: int):
         self.image_height = height
 
+    def snapshot(self):
+        """undo 용 현재 상태 복사본"""
+        origin = list(self.origin) if self.origin is not None else None
+        return origin, self.resolution, self.image_height
+
+    def restore(self, state):
+        origin, self.resolution, self.image_height = state
+        self.origin = list(origin) if origin is not None else None
+
+    def apply_resample(self, scale: float, new_height: int):
+        """
+        리샘플링 결과에 맞춰 resolution/origin 갱신
+        블록은 이미지 좌상단 기준으로 정렬되므로 좌상단의 실좌표가 유지되도록
+        origin y 를 보정한다.
+        """
+        if self.resolution is None:
+            return
+        old_res = self.resolution
+        new_res = old_res / scale
+        if self.origin is not None and self.image_height is not None:
+            ox_m, oy_m, theta = self.origin
+            top_m = oy_m + self.image_height * old_res
+            self.origin = [ox_m, top_m - new_height * new_res, theta]
+        self.resolution = new_res
+        if self.image_height is not None:
+            self.image_height = new_height
+
+    def apply_offset(self, left_px: int, bottom_px: int, new_height: int):
+        """
+        crop/pad 후 실좌표가 유지되도록 origin 이동
+        left_px/bottom_px: 왼쪽/아래쪽에서 잘라낸 픽셀 수 (pad 는 음수)
+        """
+        if self.origin is not None and self.resolution is not None:
+            ox_m, oy_m, theta = self.origin
+            self.origin = [
+                ox_m + left_px * self.resolution,
+                oy_m + bottom_px * self.resolution,
+                theta,
+            ]
+        if self.image_height is not None:
+            self.image_height = new_height
+
     def get_origin_pixel_position(self):
         if self.origin is None or self.resolution is None or self.image_height is None:
             return None
@@ -53,3 +159,13 @@ class MapMetadata:
         x = ox_m + px * self.resolution
         y = oy_m + (self.image_height - py) * self.resolution  # y축 반전 고려
         return x, y
+
+    def world_to_pixel(self, x: float, y: float):
+        """실좌표 (x[m], y[m]) → 픽셀 좌표 (px, py). pixel_to_world 의 역변환"""
+        if self.origin is None or self.resolution is None or self.image_height is None:
+            return None
+
+        ox_m, oy_m, _ = self.origin
+        px = (x - ox_m) / self.resolution
+        py = self.image_height - (y - oy_m) / self.resolution
+        return int(px), int(py)
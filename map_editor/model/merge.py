@@ -0,0 +1,196 @@
+"""
+여러 맵을 YAML origin 기준으로 한 장으로 합치기
+
+- 각 맵을 resolution/origin 으로 공통 world 격자에 배치 (nearest 샘플링)
+- 겹치는 칸 규칙
+    "obstacle": occupied > free > unknown (하나라도 장애물이면 장애물)
+    "newest"  : 목록 뒤쪽(최신) 맵의 값. 단 unknown 은 기존 값을 지우지 않음
+- 결과는 타일 단위로 계산해 map_server 형식 PGM 으로 한 타일 행씩 바로 기록하므로
+  합친 맵 전체가 메모리에 올라오지 않는다. (입력 맵은 칸당 1바이트로 보관)
+- grayscale 입력은 YAML threshold 로, 에디터 팔레트로 저장된 컬러 입력은 그대로 분류
+- origin 의 yaw 는 무시한다 (map_server 와 동일)
+"""
+
+import math
+import os
+
+import numpy as np
+from PyQt5.QtGui import QImage
+
+from . import palette
+from .map_metadata import MapMetadata, MapMetadataError
+from .occupancy import classify_image
+from .pixel_buffer import ensure_argb32, image_view
+from .tiles import DEFAULT_TILE_SIZE
+
+RULES = ("obstacle", "newest")
+
+# 칸 분류 코드 (값이 클수록 "obstacle" 규칙에서 우선)
+UNKNOWN, FREE, OCCUPIED = 0, 1, 2
+
+# map_server 기본 trinary 저장 값 (negate=0)
+_PGM_VALUES = np.array([205, 254, 0], dtype=np.uint8)
+
+
+class MapMergeError(ValueError):
+    pass
+
+
+class MergeSource:
+    """합칠 맵 하나: 메타데이터 + 분류 코드 배열 (h, w) uint8"""
+
+    def __init__(self, metadata: MapMetadata, classes: np.ndarray):
+        self.metadata = metadata
+        self.classes = classes
+
+    @classmethod
+    def from_yaml(cls, yaml_path: str) -> "MergeSource":
+        meta = MapMetadata()
+        try:
+            meta.load_from_yaml(yaml_path)
+        except MapMetadataError as e:
+            raise MapMergeError(f"{yaml_path}: {e}") from None
+        img = QImage()
+        if not meta.image_path or not img.load(meta.image_path):
+            raise MapMergeError(f"cannot load map image for {yaml_path}")
+        meta.set_image_height(img.height())
+        return cls(meta, _classify(img, meta))
+
+    def world_bounds(self):
+        """(min_x, min_y, max_x, max_y) [m]"""
+        ox, oy = self.metadata.origin[0], self.metadata.origin[1]
+        h, w = self.classes.shape
+        res = self.metadata.resolution
+        return ox, oy, ox + w * res, oy + h * res
+
+
+def _classify(img: QImage, meta: MapMetadata) -> np.ndarray:
+    """
+    이미지 포맷으로 판단해서 코드 배열로 변환
+    - grayscale (PGM 등 map_server 이미지): 항상 YAML threshold 로 분류
+      (0/255 만 있는 이진 맵도 팔레트로 오인하지 않음)
+    - 컬러: 전부 에디터 3색 팔레트 값이면 그대로, 아니면 threshold 로 분류
+    """
+    argb = None
+    if img.format() not in (QImage.Format_Grayscale8, QImage.Format_Indexed8):
+        argb = ensure_argb32(img)
+        if not np.isin(image_view(argb), palette.PALETTE).all():
+            argb = None
+    if argb is None:
+        argb, _ = classify_image(
+            img, meta.occupied_thresh, meta.free_thresh, meta.negate
+        )
+    # pixels 는 argb 버퍼를 그대로 보므로 argb 를 끝까지 붙잡아 둔다
+    pixels = image_view(argb)
+    codes = np.full(pixels.shape, UNKNOWN, dtype=np.uint8)
+    codes[pixels == palette.INSIDE] = FREE
+    codes[pixels == palette.BOUNDARY] = OCCUPIED
+    return codes
+
+
+def merged_grid(sources, resolution=None):
+    """
+    합친 격자 (resolution, origin_x, origin_y, width, height)
+    resolution 을 안 주면 가장 세밀한 입력 resolution 사용
+    """
+    if not sources:
+        raise MapMergeError("no maps to merge")
+    if resolution is None:
+        resolution = min(s.metadata.resolution for s in sources)
+    bounds = np.array([s.world_bounds() for s in sources])
+    min_x, min_y = bounds[:, 0].min(), bounds[:, 1].min()
+    max_x, max_y = bounds[:, 2].max(), bounds[:, 3].max()
+    width = int(math.ceil((max_x - min_x) / resolution - 1e-9))
+    height = int(math.ceil((max_y - min_y) / resolution - 1e-9))
+    return resolution, min_x, min_y, width, height
+
+
+def _sample_tile(source, world_x, world_y):
+    """
+    타일 칸 중심 world 좌표 (world_x: 열별, world_y: 행별) 에서 source 의 코드
+    source 범위 밖 칸은 UNKNOWN. 타일과 전혀 겹치지 않으면 None
+    """
+    meta = source.metadata
+    h, w = source.classes.shape
+    sx = np.floor((world_x - meta.origin[0]) / meta.resolution).astype(np.intp)
+    sy = np.floor(h - (world_y - meta.origin[1]) / meta.resolution).astype(np.intp)
+    col_ok = (sx >= 0) & (sx < w)
+    row_ok = (sy >= 0) & (sy < h)
+    if not col_ok.any() or not row_ok.any():
+        return None
+    codes = np.full((sy.size, sx.size), UNKNOWN, dtype=np.uint8)
+    rows, cols = np.nonzero(row_ok)[0], np.nonzero(col_ok)[0]
+    codes[np.ix_(rows, cols)] = source.classes[np.ix_(sy[rows], sx[cols])]
+    return codes
+
+
+def merge_tile(sources, rule, world_x, world_y):
+    """타일 하나를 규칙대로 합친 코드 배열"""
+    out = np.full((world_y.size, world_x.size), UNKNOWN, dtype=np.uint8)
+    for source in sources:
+        codes = _sample_tile(source, world_x, world_y)
+        if codes is None:
+            continue
+        if rule == "obstacle":
+            np.maximum(out, codes, out=out)
+        else:
+            known = codes != UNKNOWN
+            out[known] = codes[known]
+    return out
+
+
+def merge_maps(
+    yaml_paths,
+    out_yaml: str,
+    rule="obstacle",
+    resolution=None,
+    tile_size=DEFAULT_TILE_SIZE,
+    progress=None,
+) -> MapMetadata:
+    """
+    yaml_paths 의 맵들을 합쳐 out_yaml (+ 같은 이름의 .pgm) 으로 저장
+    목록 순서가 오래된 → 최신 순서 ("newest" 규칙 기준)
+    반환: 결과 맵의 MapMetadata
+    """
+    if rule not in RULES:
+        raise MapMergeError(f"unknown merge rule: {rule}")
+    sources = [MergeSource.from_yaml(path) for path in yaml_paths]
+    resolution, min_x, min_y, width, height = merged_grid(sources, resolution)
+    max_y = min_y + height * resolution
+
+    bounds = [s.world_bounds() for s in sources]
+    image_path = os.path.splitext(out_yaml)[0] + ".pgm"
+    total = (height + tile_size - 1) // tile_size
+    with open(image_path, "wb") as f:
+        f.write(f"P5\n{width} {height}\n255\n".encode("ascii"))
+        for index, y0 in enumerate(range(0, height, tile_size)):
+            rows = min(tile_size, height - y0)
+            world_y = max_y - (y0 + np.arange(rows) + 0.5) * resolution
+            band = np.empty((rows, width), dtype=np.uint8)
+            for x0 in range(0, width, tile_size):
+                cols = min(tile_size, width - x0)
+                world_x = min_x + (x0 + np.arange(cols) + 0.5) * resolution
+                # 타일과 겹치는 맵만 (목록 순서 유지)
+                overlapping = [
+                    s
+                    for s, (bx0, by0, bx1, by1) in zip(sources, bounds)
+                    if bx0 < world_x[-1] + resolution
+                    and bx1 > world_x[0] - resolution
+                    and by0 < world_y[0] + resolution
+                    and by1 > world_y[-1] - resolution
+                ]
+                band[:, x0 : x0 + cols] = _PGM_VALUES[
+                    merge_tile(overlapping, rule, world_x, world_y)
+                ]
+            f.write(band.tobytes())
+            if progress is not None:
+                progress(index + 1, total)
+
+    meta = MapMetadata()
+    meta.resolution = resolution
+    meta.origin = [float(min_x), float(min_y), 0.0]
+    meta.image_path = image_path
+    meta.set_image_height(height)
+    with open(out_yaml, "w") as f:
+        f.write(meta.to_yaml_text(os.path.basename(image_path)))
+    return meta
@@ -0,0 +1,145 @@
+"""
+SLAM 노이즈 정리용 형태학 연산 (팔레트 클래스 단위)
+
+- erode / dilate / open / close: 지정 클래스 마스크에 커널 적용
+- remove_speckles: 지정 클래스의 작은 연결 요소 제거
+
+클래스에서 빠지게 된 픽셀은 주변의 다른 클래스 픽셀 값으로 채운다.
+모든 함수는 band 단위로 호출되어도 되도록 입력 배열만 보고 동작한다.
+"""
+
+import numpy as np
+from scipy import ndimage
+
+OPERATIONS = ("erode", "dilate", "open", "close")
+KERNEL_SHAPES = ("square", "cross", "disk")
+
+_NEIGHBOURS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def make_kernel(size: int, shape: str = "square") -> np.ndarray:
+    """size x size bool 커널"""
+    size = max(1, int(size))
+    if shape == "square":
+        return np.ones((size, size), dtype=bool)
+    c = (size - 1) / 2.0
+    yy, xx = np.mgrid[:size, :size]
+    if shape == "cross":
+        return (np.abs(yy - c) < 0.5 + 1e-9) | (np.abs(xx - c) < 0.5 + 1e-9)
+    if shape == "disk":
+        return (yy - c) ** 2 + (xx - c) ** 2 <= (size / 2.0) ** 2
+    raise ValueError(f"unknown kernel shape: {shape}")
+
+
+def _shift_or(mask, offsets):
+    """offsets 만큼 이동한 mask 들의 OR (범위 밖은 False)"""
+    h, w = mask.shape
+    out = np.zeros_like(mask)
+    for dy, dx in offsets:
+        if abs(dy) >= h or abs(dx) >= w:
+            continue  # 전부 범위 밖으로 밀려남
+        ys, yd = (
+            (slice(0, h - dy), slice(dy, h))
+            if dy >= 0
+            else (slice(-dy, h), slice(0, h + dy))
+        )
+        xs, xd = (
+            (slice(0, w - dx), slice(dx, w))
+            if dx >= 0
+            else (slice(-dx, w), slice(0, w + dx))
+        )
+        out[yd, xd] |= mask[ys, xs]
+    return out
+
+
+def dilate(mask: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    kh, kw = kernel.shape
+    cy, cx = kh // 2, kw // 2
+    if kernel.all():
+        # 사각형은 가로/세로로 분리해서 O(kh + kw)
+        rows = _shift_or(mask, [(0, dx - cx) for dx in range(kw)])
+        return _shift_or(rows, [(dy - cy, 0) for dy in range(kh)])
+    offsets = [(dy - cy, dx - cx) for dy, dx in zip(*np.nonzero(kernel))]
+    return _shift_or(mask, offsets)
+
+
+def erode(mask: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """이미지 밖은 클래스에 속한 것으로 간주 (가장자리에서 깎이지 않음)"""
+    return ~dilate(~mask, kernel[::-1, ::-1])
+
+
+def _morph_mask(mask, op, kernel):
+    if op == "erode":
+        return erode(mask, kernel)
+    if op == "dilate":
+        return dilate(mask, kernel)
+    if op == "open":
+        return dilate(erode(mask, kernel), kernel)
+    if op == "close":
+        return erode(dilate(mask, kernel), kernel)
+    raise ValueError(f"unknown morphology operation: {op}")
+
+
+def _fill_vacated(out, vacated, value):
+    """
+    vacated 픽셀을 8-이웃 중 다른 클래스 픽셀 값으로 바깥쪽부터 채움
+    비어있는 픽셀 좌표만 다루므로 비용은 vacated 개수에 비례
+    """
+    h, w = out.shape
+    ys, xs = np.nonzero(vacated)
+    ok = ~vacated & (out != value)
+    while ys.size:
+        filled = np.zeros(ys.size, dtype=bool)
+        src_y = np.empty_like(ys)
+        src_x = np.empty_like(xs)
+        for dy, dx in _NEIGHBOURS:
+            ny = np.clip(ys + dy, 0, h - 1)
+            nx = np.clip(xs + dx, 0, w - 1)
+            hit = ~filled & ok[ny, nx]
+            src_y[hit], src_x[hit] = ny[hit], nx[hit]
+            filled |= hit
+        if not filled.any():
+            break  # 채울 값이 없으면 원래 클래스 유지
+        out[ys[filled], xs[filled]] = out[src_y[filled], src_x[filled]]
+        ok[ys[filled], xs[filled]] = True
+        ys, xs = ys[~filled], xs[~filled]
+
+
+def _compose(pixels, mask, new_mask, value):
+    """new_mask 로 바뀐 클래스 마스크를 픽셀에 반영한 새 배열"""
+    out = pixels.copy()
+    out[new_mask & ~mask] = np.uint32(value)
+    _fill_vacated(out, mask & ~new_mask, value)
+    return out
+
+
+def apply_class_morphology(
+    pixels: np.ndarray, op: str, value: int, size: int = 3, shape: str = "square"
+) -> np.ndarray:
+    """value 클래스에 op 적용한 결과 (새 배열)"""
+    mask = pixels == value
+    new_mask = _morph_mask(mask, op, make_kernel(size, shape))
+    return _compose(pixels, mask, new_mask, value)
+
+
+def remove_speckles(
+    pixels: np.ndarray, value: int, min_pixels: int, inner=None
+) -> np.ndarray:
+    """
+    value 클래스 중 8-연결 요소 크기가 min_pixels 미만인 것 제거 (새 배열)
+    연결 요소가 band 경계를 넘을 수 있으므로 영역 전체에 한 번에 호출한다.
+    inner: 지울 수 있는 부분 (행, 열 slice). 그 밖에 픽셀이 하나라도 있는 요소는
+    영역 밖으로 더 이어질 수 있으므로 크기와 상관없이 남긴다.
+    """
+    mask = pixels == value
+    labels, count = ndimage.label(mask, structure=np.ones((3, 3), dtype=bool))
+    if count == 0:
+        return pixels.copy()
+    sizes = np.bincount(labels.ravel(), minlength=count + 1)
+    small = sizes < int(min_pixels)
+    if inner is not None:
+        outside = np.ones(mask.shape, dtype=bool)
+        outside[inner] = False
+        small[labels[outside]] = False
+    small[0] = False  # 배경
+    return _compose(pixels, mask, mask & ~small[labels], value)
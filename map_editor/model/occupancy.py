@@ -0,0 +1,86 @@
+"""
+원본 grayscale occupancy grid → 에디터 3색 팔레트 변환
+
+ROS map_server 와 같은 규칙으로 분류한다.
+    p = (255 - gray) / 255  (negate 면 gray / 255)
+    p > occupied_thresh → occupied (boundary, #FFFFFF)
+    p < free_thresh     → free     (inside,   #010101)
+    그 외               → unknown  (outside,  #000000)
+컬러 이미지는 RGB 평균을 gray 로 사용한다.
+
+gray 값(또는 RGB 합) 별 lookup table 을 만들어 행 청크 단위로 한 번에 변환한다.
+"""
+
+import numpy as np
+from PyQt5.QtGui import QImage
+
+from . import palette
+from .pixel_buffer import image_view, new_image
+
+CLASS_NAMES = ("occupied", "free", "unknown")
+
+
+def classification_lut(occupied_thresh, free_thresh, negate, levels=256):
+    """
+    gray 단계별 팔레트 값 / 클래스 인덱스 LUT
+    levels: 입력 단계 수 (grayscale 256, RGB 합 766)
+    """
+    gray = np.arange(levels) * (255.0 / (levels - 1))
+    p = gray / 255.0 if negate else (255.0 - gray) / 255.0
+
+    classes = np.full(levels, 2, dtype=np.uint8)  # unknown
+    classes[p > occupied_thresh] = 0
+    classes[p < free_thresh] = 1
+    values = np.array(
+        [palette.BOUNDARY, palette.INSIDE, palette.OUTSIDE], dtype=np.uint32
+    )[classes]
+    return values, classes
+
+
+def _gray_view(img: QImage) -> np.ndarray:
+    """Grayscale8 이미지 버퍼를 (h, w) uint8 배열로 노출"""
+    h, w = img.height(), img.width()
+    ptr = img.bits()
+    ptr.setsize(img.byteCount())
+    return np.frombuffer(ptr, dtype=np.uint8).reshape(h, img.bytesPerLine())[:, :w]
+
+
+def classify_image(src: QImage, occupied_thresh, free_thresh, negate, chunk_rows=512):
+    """
+    src 를 팔레트 이미지로 변환
+    반환: (ARGB32 QImage, {클래스 이름: 픽셀 수})
+    """
+    if src.format() in (QImage.Format_Grayscale8, QImage.Format_Indexed8):
+        if src.format() == QImage.Format_Indexed8:
+            src = src.convertToFormat(QImage.Format_Grayscale8)
+        levels = 256
+        rows_of = _gray_view(src)
+
+        def levels_of(chunk):
+            return chunk
+
+    else:
+        if src.format() != QImage.Format_ARGB32:
+            src = src.convertToFormat(QImage.Format_ARGB32)
+        levels = 766
+        rows_of = image_view(src)
+
+        def levels_of(chunk):
+            r = (chunk >> 16) & 0xFF
+            g = (chunk >> 8) & 0xFF
+            b = chunk & 0xFF
+            return (r + g + b).astype(np.intp)
+
+    values, classes = classification_lut(occupied_thresh, free_thresh, negate, levels)
+    dst = new_image(src.width(), src.height())
+    out = image_view(dst)
+    level_counts = np.zeros(levels, dtype=np.int64)
+
+    for r0 in range(0, src.height(), chunk_rows):
+        lv = levels_of(rows_of[r0 : r0 + chunk_rows])
+        out[r0 : r0 + chunk_rows] = values[lv]
+        level_counts += np.bincount(lv.ravel(), minlength=levels)
+
+    class_counts = np.bincount(classes, weights=level_counts, minlength=3)
+    histogram = {name: int(count) for name, count in zip(CLASS_NAMES, class_counts)}
+    return dst, histogram
@@ -0,0 +1,32 @@
+"""
+맵 에디터 3색 팔레트 정의
+
+픽셀 값은 QImage.Format_ARGB32 의 32bit 정수(0xAARRGGBB) 기준
+"""
+
+import numpy as np
+
+OUTSIDE = 0xFF000000  # #000000 (외부 / unknown)
+INSIDE = 0xFF010101  # #010101 (내부 / free)
+BOUNDARY = 0xFFFFFFFF  # #FFFFFF (경계 / obstacle)
+
+PALETTE = (OUTSIDE, INSIDE, BOUNDARY)
+
+HIGHLIGHT = 0xFFFF0000  # "Show occupied area" 에서 inside 표시 색
+
+# 보수적 축소 시 우선순위 (값이 클수록 우선)
+#   boundary > outside(및 팔레트 외 색) > inside
+RANK_INSIDE = 0
+RANK_OUTSIDE = 1
+RANK_BOUNDARY = 2
+
+
+def class_rank(pixels):
+    """
+    ARGB32 픽셀 배열 → 우선순위 배열 (uint8)
+    팔레트 외 색은 outside 와 같은 순위로 취급
+    """
+    rank = np.full(pixels.shape, RANK_OUTSIDE, dtype=np.uint8)
+    rank[pixels == INSIDE] = RANK_INSIDE
+    rank[pixels == BOUNDARY] = RANK_BOUNDARY
+    return rank
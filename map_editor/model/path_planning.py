@@ -0,0 +1,193 @@
+"""
+두 지점 사이 도달 가능 여부 / 경로 확인 (A*)
+
+- 통행 가능 셀: inside(#010101). allow_unknown 이면 outside(#000000) 도 포함
+- 로봇 반경만큼 장애물을 팽창 (band 단위 거리 변환)
+- 맵이 바뀌지 않았으면 팽창된 격자와 연결 요소 라벨을 재사용하므로
+  도달 불가능한 경우는 탐색 없이 바로 판단한다.
+"""
+
+import heapq
+import math
+
+import numpy as np
+from scipy import ndimage
+
+from . import palette
+from .filters import FilterExecutor
+
+
+def _inflate_band(radius_px):
+    def func(band):
+        blocked = band.astype(bool)
+        if radius_px <= 0 or not blocked.any():
+            return band
+        dist = ndimage.distance_transform_edt(~blocked)
+        return (dist <= radius_px).view(np.uint8)
+
+    return func
+
+
+# 8방향 이동 (dx, dy, 비용). 정수 octile 비용: 직선 2, 대각선 3 (≈ 2√2)
+_MOVES = (
+    (1, 0, 2),
+    (-1, 0, 2),
+    (0, 1, 2),
+    (0, -1, 2),
+    (1, 1, 3),
+    (1, -1, 3),
+    (-1, 1, 3),
+    (-1, -1, 3),
+)
+_NO_PARENT = 255
+
+
+class PathPlanner:
+    def __init__(self, executor: FilterExecutor = None):
+        self._executor = executor or FilterExecutor()
+        self._key = None
+        self._passable = None  # 테두리 1칸을 막아둔 (h+2, w+2) uint8
+        self._labels = None
+        self._objects = None  # 연결 요소별 bbox (ndimage.find_objects)
+
+    def prepare(self, pixels: np.ndarray, revision, radius_px=0.0, allow_unknown=False):
+        """맵 상태가 (revision, 반경, unknown 허용) 기준으로 바뀌었을 때만 다시 계산"""
+        key = (revision, pixels.shape, float(radius_px), bool(allow_unknown))
+        if key == self._key:
+            return
+        obstacle = pixels != palette.INSIDE
+        if allow_unknown:
+            obstacle &= pixels != palette.OUTSIDE
+        obstacle = obstacle.view(np.uint8)
+
+        if radius_px > 0:
+            halo = int(math.ceil(radius_px)) + 1
+            obstacle = self._executor.run(_inflate_band(radius_px), obstacle, halo=halo)
+
+        h, w = pixels.shape
+        passable = np.zeros((h + 2, w + 2), dtype=np.uint8)
+        passable[1:-1, 1:-1] = obstacle == 0
+
+        structure = np.ones((3, 3), dtype=bool)
+        try:
+            labels, _ = ndimage.label(passable, structure, output=np.uint16)
+        except RuntimeError:
+            # 연결 요소가 65535 개를 넘으면 더 큰 타입으로
+            labels, _ = ndimage.label(passable, structure, output=np.int32)
+
+        self._passable = passable
+        self._labels = labels
+        self._objects = ndimage.find_objects(labels)
+        self._key = key
+
+    def is_free(self, x: int, y: int) -> bool:
+        h, w = self._passable.shape
+        return 0 <= x < w - 2 and 0 <= y < h - 2 and bool(self._passable[y + 1, x + 1])
+
+    def is_reachable(self, start, goal) -> bool:
+        (sx, sy), (gx, gy) = start, goal
+        if not (self.is_free(sx, sy) and self.is_free(gx, gy)):
+            return False
+        return self._labels[sy + 1, sx + 1] == self._labels[gy + 1, gx + 1]
+
+    def find_path(self, start, goal):
+        """
+        8방향 A* (대각선은 모서리를 가로지르지 않음). 경로 [(x, y), ...] 또는 None
+
+        정수 비용이라 f 값별 bucket 으로 나눠, 같은 f 의 노드를 한꺼번에
+        numpy 로 확장한다. 탐색은 시작점이 속한 연결 요소의 bbox 안에서만 한다.
+        """
+        start = (int(start[0]), int(start[1]))
+        goal = (int(goal[0]), int(goal[1]))
+        if not self.is_reachable(start, goal):
+            return None
+
+        # 연결 요소 bbox (+테두리 1칸) 안의 격자만 사용
+        label = self._labels[start[1] + 1, start[0] + 1]
+        ys, xs = self._objects[label - 1]
+        y0, x0 = ys.start - 1, xs.start - 1
+        sub = self._labels[y0 : ys.stop + 1, x0 : xs.stop + 1] == label
+        H, W = sub.shape
+        grid = sub.ravel()
+
+        s = (start[1] + 1 - y0) * W + (start[0] + 1 - x0)
+        t = (goal[1] + 1 - y0) * W + (goal[0] + 1 - x0)
+        ty, tx = divmod(t, W)
+
+        def heuristic(idx):
+            dy, dx = np.divmod(idx, W)
+            dx = np.abs(dx - tx)
+            dy = np.abs(dy - ty)
+            return 2 * np.maximum(dx, dy) + np.minimum(dx, dy)
+
+        g = np.full(H * W, np.iinfo(np.uint32).max, dtype=np.uint32)
+        parent = np.full(H * W, _NO_PARENT, dtype=np.uint8)
+        closed = np.zeros(H * W, dtype=bool)
+        offsets = np.array([dy * W + dx for dx, dy, _ in _MOVES], dtype=np.intp)
+        costs = np.array([cost for _, _, cost in _MOVES], dtype=np.int64)
+        directions = np.arange(len(_MOVES), dtype=np.uint8)
+
+        g[s] = 0
+        f0 = int(heuristic(np.array([s]))[0])
+        buckets = {f0: [np.array([s], dtype=np.intp)]}
+        queue = [f0]
+
+        while queue:
+            f = heapq.heappop(queue)
+            nodes = np.unique(np.concatenate(buckets.pop(f)))
+            # 이미 닫혔거나 더 좋은 g 로 갱신되어 f 가 달라진 항목 제거
+            nodes = nodes[~closed[nodes]]
+            nodes = nodes[g[nodes].astype(np.int64) + heuristic(nodes) == f]
+            if nodes.size == 0:
+                continue
+            closed[nodes] = True
+            if closed[t]:
+                break
+
+            # 8방향을 한 번에 확장 (n, 8)
+            nb = nodes[:, None] + offsets
+            ok = grid[nb] & ~closed[nb]
+            right, left = grid[nodes + 1], grid[nodes - 1]
+            down, up = grid[nodes + W], grid[nodes - W]
+            ok[:, 4] &= right & down
+            ok[:, 5] &= right & up
+            ok[:, 6] &= left & down
+            ok[:, 7] &= left & up
+
+            ng = (g[nodes].astype(np.int64)[:, None] + costs)[ok]
+            dirs = np.broadcast_to(directions, nb.shape)[ok]
+            nb = nb[ok]
+            better = ng < g[nb]
+            nb, ng, dirs = nb[better], ng[better], dirs[better]
+            if nb.size == 0:
+                continue
+            np.minimum.at(g, nb, ng.astype(np.uint32))
+            won = g[nb] == ng
+            nb, ng, dirs = nb[won], ng[won], dirs[won]
+            # 같은 셀에 여러 부모가 동률이면 하나만 남긴다
+            nb, first = np.unique(nb, return_index=True)
+            ng, dirs = ng[first], dirs[first]
+            parent[nb] = dirs
+
+            fvals = ng + heuristic(nb)
+            for fv in np.unique(fvals).tolist():
+                if fv not in buckets:
+                    buckets[fv] = []
+                    heapq.heappush(queue, fv)
+                buckets[fv].append(nb[fvals == fv])
+        else:
+            return None
+
+        path = [int(t)]
+        while path[-1] != s:
+            path.append(path[-1] - int(offsets[parent[path[-1]]]))
+        path.reverse()
+        return [(i % W + x0 - 1, i // W + y0 - 1) for i in path]
+
+
+def path_length(path) -> float:
+    """경로 길이 (픽셀 단위)"""
+    if not path or len(path) < 2:
+        return 0.0
+    pts = np.asarray(path, dtype=float)
+    return float(np.hypot(*np.diff(pts, axis=0).T).sum())
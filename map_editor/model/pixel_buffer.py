@@ -0,0 +1,40 @@
+import numpy as np
+from PyQt5.QtGui import QImage
+
+
+def ensure_argb32(img: QImage) -> QImage:
+    """numpy 로 다루기 위해 ARGB32 포맷으로 통일 (이미 ARGB32 면 그대로 반환)"""
+    if img.isNull() or img.format() == QImage.Format_ARGB32:
+        return img
+    return img.convertToFormat(QImage.Format_ARGB32)
+
+
+def image_view(img: QImage) -> np.ndarray:
+    """
+    ARGB32 QImage 의 픽셀 버퍼를 복사 없이 (h, w) uint32 배열로 노출
+    반환된 배열에 쓰면 이미지가 직접 바뀐다.
+    배열은 img 가 살아있는 동안만 유효하다.
+    """
+    if img.format() != QImage.Format_ARGB32:
+        raise ValueError("image_view() requires a Format_ARGB32 image")
+    h, w = img.height(), img.width()
+    ptr = img.bits()
+    ptr.setsize(img.byteCount())
+    arr = np.frombuffer(ptr, dtype=np.uint32).reshape(h, img.bytesPerLine() // 4)
+    return arr[:, :w]
+
+
+def new_image(width: int, height: int, fill=None) -> QImage:
+    """ARGB32 빈 이미지 생성 (fill 이 주어지면 해당 ARGB 값으로 채움)"""
+    img = QImage(int(width), int(height), QImage.Format_ARGB32)
+    if fill is not None:
+        img.fill(int(fill))
+    return img
+
+
+def image_from_array(pixels: np.ndarray) -> QImage:
+    """(h, w) uint32 ARGB 배열 → 독립된 QImage (배열 내용을 복사)"""
+    h, w = pixels.shape
+    img = new_image(w, h)
+    image_view(img)[:] = pixels
+    return img
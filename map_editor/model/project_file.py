@@ -0,0 +1,276 @@
+"""
+맵 프로젝트 파일 (.mapproj)
+
+픽셀 + 메타데이터 YAML + overlay 설정 + 최근 편집 기록을 한 파일에 저장한다.
+
+레이아웃
+    MAGIC
+    타일 블록들 ...            (tile_size x tile_size, 행 우선 순서)
+    history 블록들 ...
+    footer JSON (utf-8)
+    footer 오프셋 / 길이 (<QQ) + MAGIC
+
+각 블록: 픽셀을 파일 팔레트 인덱스(uint16)로 바꾼 뒤 run-length 인코딩하고 zlib 압축.
+occupancy 맵은 대부분 긴 단색 구간이라 PNG 보다 훨씬 작고 빠르다.
+footer 에 타일별 (offset, length) 가 있으므로 일부 타일만 읽을 수 있다.
+"""
+
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from . import palette
+from .tiles import DEFAULT_TILE_SIZE, tile_grid, tile_rect
+
+MAGIC = b"MAPPROJ\x01"
+FORMAT_VERSION = 1
+_TRAILER = struct.Struct("<QQ")
+_MAX_PALETTE = 1 << 16
+
+
+class ProjectFormatError(ValueError):
+    pass
+
+
+class _PaletteEncoder:
+    """픽셀 값 → 팔레트 인덱스. 3색 팔레트는 미리 등록, 나머지는 만나는 대로 추가"""
+
+    def __init__(self):
+        self.values = list(palette.PALETTE)
+        self._index = {v: i for i, v in enumerate(self.values)}
+
+    def encode(self, pixels: np.ndarray) -> np.ndarray:
+        idx = np.full(pixels.shape, _MAX_PALETTE - 1, dtype=np.uint16)
+        known = np.zeros(pixels.shape, dtype=bool)
+        for value in palette.PALETTE:
+            hit = pixels == value
+            idx[hit] = self._index[value]
+            known |= hit
+        if not known.all():
+            others = pixels[~known]
+            for value in np.unique(others).tolist():
+                if value not in self._index:
+                    if len(self.values) >= _MAX_PALETTE - 1:
+                        raise ProjectFormatError("too many distinct colors")
+                    self._index[value] = len(self.values)
+                    self.values.append(value)
+            lut_keys = np.array(sorted(self._index), dtype=np.uint32)
+            lut_vals = np.array([self._index[k] for k in lut_keys.tolist()])
+            pos = np.searchsorted(lut_keys, others)
+            idx[~known] = lut_vals[pos]
+        return idx
+
+
+def _encode_block(idx: np.ndarray) -> bytes:
+    flat = idx.ravel()
+    starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))
+    lengths = np.diff(np.append(starts, flat.size)).astype(np.uint32)
+    values = flat[starts].astype(np.uint16)
+    raw = struct.pack("<I", len(starts)) + lengths.tobytes() + values.tobytes()
+    return zlib.compress(raw, 1)
+
+
+def _decode_block(blob: bytes, shape, colors: np.ndarray) -> np.ndarray:
+    try:
+        raw = zlib.decompress(blob)
+        (count,) = struct.unpack_from("<I", raw)
+        lengths = np.frombuffer(raw, dtype=np.uint32, count=count, offset=4)
+        values = np.frombuffer(raw, dtype=np.uint16, count=count, offset=4 + 4 * count)
+        if int(lengths.sum(dtype=np.uint64)) == shape[0] * shape[1]:
+            return np.repeat(colors[values], lengths).reshape(shape)
+    except (zlib.error, struct.error, ValueError, IndexError):
+        pass
+    raise ProjectFormatError("corrupted block")
+
+
+def save_project(
+    path: str,
+    pixels: np.ndarray,
+    metadata_yaml: str = "",
+    overlays: dict = None,
+    history=(),
+    tile_size: int = DEFAULT_TILE_SIZE,
+):
+    """
+    history: [(meta_state 또는 None, full 여부, [(x, y, patch 배열), ...]), ...]
+             오래된 것 → 최근 순서
+    임시 파일에 다 쓴 뒤 교체하므로 실패해도 기존 파일이 깨지지 않는다.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        _write_project(tmp_path, pixels, metadata_yaml, overlays, history, tile_size)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_project(path, pixels, metadata_yaml, overlays, history, tile_size):
+    h, w = pixels.shape
+    encoder = _PaletteEncoder()
+    cols, rows = tile_grid(w, h, tile_size)
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        tiles = []
+        for ty in range(rows):
+            for tx in range(cols):
+                x, y, tw, th = tile_rect(tx, ty, w, h, tile_size)
+                blob = _encode_block(encoder.encode(pixels[y : y + th, x : x + tw]))
+                tiles.append((f.tell(), len(blob)))
+                f.write(blob)
+
+        history_index = []
+        for meta_state, full, patches in history:
+            entry = {"meta": meta_state, "full": bool(full), "patches": []}
+            for x, y, patch in patches:
+                blob = _encode_block(encoder.encode(patch))
+                entry["patches"].append(
+                    [
+                        int(x),
+                        int(y),
+                        patch.shape[1],
+                        patch.shape[0],
+                        f.tell(),
+                        len(blob),
+                    ]
+                )
+                f.write(blob)
+            history_index.append(entry)
+
+        footer = {
+            "version": FORMAT_VERSION,
+            "width": w,
+            "height": h,
+            "tile_size": tile_size,
+            "palette": encoder.values,
+            "tiles": tiles,
+            "metadata_yaml": metadata_yaml,
+            "overlays": overlays or {},
+            "history": history_index,
+        }
+        data = json.dumps(footer).encode("utf-8")
+        offset = f.tell()
+        f.write(data)
+        f.write(_TRAILER.pack(offset, len(data)))
+        f.write(MAGIC)
+
+
+def _valid_history_entry(meta, full, patches) -> bool:
+    """footer 의 history 항목 형식 확인 (meta 는 snapshot() 3-tuple)"""
+    if meta is not None and (not isinstance(meta, list) or len(meta) != 3):
+        return False
+    if full and len(patches) != 1:
+        return False
+    return all(len(p) == 6 for p in patches)
+
+
+class ProjectReader:
+    """프로젝트 파일 읽기. 필요한 타일만 디코딩할 수 있다."""
+
+    def __init__(self, path: str):
+        self._f = open(path, "rb")
+        try:
+            self._read_footer()
+        except Exception:
+            self._f.close()
+            raise
+
+    def _read_footer(self):
+        f = self._f
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ProjectFormatError("not a map project file")
+        f.seek(-(_TRAILER.size + len(MAGIC)), 2)
+        offset, length = _TRAILER.unpack(f.read(_TRAILER.size))
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ProjectFormatError("truncated map project file")
+        f.seek(offset)
+        try:
+            footer = json.loads(f.read(length).decode("utf-8"))
+            version = footer.get("version")
+        except (ValueError, AttributeError):
+            raise ProjectFormatError("corrupted map project footer") from None
+        if version != FORMAT_VERSION:
+            raise ProjectFormatError("unsupported map project version")
+
+        # 이후 읽기에서 터지지 않도록 footer 구조를 여기서 전부 확인
+        try:
+            self.width = int(footer["width"])
+            self.height = int(footer["height"])
+            self.tile_size = int(footer["tile_size"])
+            self.metadata_yaml = str(footer["metadata_yaml"])
+            self.overlays = dict(footer["overlays"])
+            self._colors = np.array(footer["palette"], dtype=np.uint32)
+            self._tiles = [(int(o), int(n)) for o, n in footer["tiles"]]
+            self._history = [
+                (
+                    entry["meta"],
+                    bool(entry["full"]),
+                    [tuple(int(v) for v in p) for p in entry["patches"]],
+                )
+                for entry in footer["history"]
+            ]
+        except (KeyError, TypeError, ValueError, OverflowError):
+            raise ProjectFormatError("corrupted map project footer") from None
+        if min(self.width, self.height, self.tile_size) <= 0:
+            raise ProjectFormatError("corrupted map project footer")
+        cols, rows = tile_grid(self.width, self.height, self.tile_size)
+        if (
+            self._colors.ndim != 1
+            or len(self._tiles) != cols * rows
+            or not all(_valid_history_entry(*entry) for entry in self._history)
+        ):
+            raise ProjectFormatError("corrupted map project footer")
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_blob(self, offset, length, shape):
+        self._f.seek(offset)
+        return _decode_block(self._f.read(length), shape, self._colors)
+
+    def read_tile(self, tx: int, ty: int) -> np.ndarray:
+        cols, _ = tile_grid(self.width, self.height, self.tile_size)
+        _, _, tw, th = tile_rect(tx, ty, self.width, self.height, self.tile_size)
+        offset, length = self._tiles[ty * cols + tx]
+        return self._read_blob(offset, length, (th, tw))
+
+    def read_region(self, x: int, y: int, w: int, h: int, out=None) -> np.ndarray:
+        """(x, y, w, h) 영역만 디코딩 (겹치는 타일만 읽음)"""
+        if out is None:
+            out = np.empty((h, w), dtype=np.uint32)
+        ts = self.tile_size
+        for ty in range(y // ts, (y + h - 1) // ts + 1):
+            for tx in range(x // ts, (x + w - 1) // ts + 1):
+                tile = self.read_tile(tx, ty)
+                x0, y0 = tx * ts, ty * ts
+                sx0, sy0 = max(x, x0), max(y, y0)
+                sx1 = min(x + w, x0 + tile.shape[1])
+                sy1 = min(y + h, y0 + tile.shape[0])
+                out[sy0 - y : sy1 - y, sx0 - x : sx1 - x] = tile[
+                    sy0 - y0 : sy1 - y0, sx0 - x0 : sx1 - x0
+                ]
+        return out
+
+    def read_history(self):
+        """save_project() 의 history 형식으로 복원"""
+        history = []
+        for meta, full, entries in self._history:
+            patches = [
+                (x, y, self._read_blob(offset, length, (ph, pw)))
+                for x, y, pw, ph, offset, length in entries
+            ]
+            history.append((tuple(meta) if meta else None, full, patches))
+        return history
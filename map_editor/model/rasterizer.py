@@ -0,0 +1,145 @@
+"""
+QPainter 를 거치지 않는 numpy 래스터라이저
+
+안티앨리어싱 없이 팔레트 값을 그대로 픽셀 버퍼에 기록한다.
+모든 도형은 행 단위 span (row, x_left, x_right[inclusive]) 목록으로 바꾼 뒤 기록한다.
+- 사각형(모든 행의 span 이 같음)은 slice 대입 한 번
+- 작은 span 묶음(브러시 등)은 fancy-index 대입 한 번
+- 큰 span 묶음은 span 별 slice 대입 (픽셀 수만큼 인덱스 배열을 만들지 않음)
+
+브러시는 중심 기준 thickness x thickness 정사각형 (square cap) 이다.
+"""
+
+import numpy as np
+
+# fancy-index 한 번으로 채울 최대 픽셀 수 (넘으면 span 별 slice 대입)
+_FANCY_FILL_LIMIT = 1 << 16
+
+
+def _empty_spans():
+    empty = np.empty(0, dtype=np.intp)
+    return empty, empty, empty
+
+
+def _segment_spans(x0, y0, x1, y1, thickness):
+    """선분 위 정수 점마다 정사각형을 찍은 영역의 행별 span"""
+    n = max(abs(x1 - x0), abs(y1 - y0), 1)
+    k = np.arange(n + 1)
+    px = np.rint(x0 + (x1 - x0) * k / n).astype(np.intp)
+    py = np.rint(y0 + (y1 - y0) * k / n).astype(np.intp)
+    if y1 < y0:
+        px, py = px[::-1], py[::-1]
+
+    before = thickness // 2  # 중심 위/왼쪽 픽셀 수
+    after = thickness - 1 - before  # 중심 아래/오른쪽 픽셀 수
+
+    rows = np.arange(py[0] - before, py[-1] + after + 1)
+    # 행 r 을 덮는 점: py in [r - after, r + before] (py 는 오름차순, px 는 단조)
+    lo = np.searchsorted(py, rows - after, side="left")
+    hi = np.searchsorted(py, rows + before, side="right") - 1
+    xa, xb = px[lo], px[hi]
+    return rows, np.minimum(xa, xb) - before, np.maximum(xa, xb) + after
+
+
+def polyline_spans(points, thickness: int):
+    """[(x, y), ...] 폴리라인 (점 하나면 정사각형 하나)"""
+    thickness = max(1, int(thickness))
+    pts = [(int(x), int(y)) for x, y in points]
+    if not pts:
+        return _empty_spans()
+    if len(pts) == 1:
+        pts = pts * 2
+    parts = [
+        _segment_spans(x0, y0, x1, y1, thickness)
+        for (x0, y0), (x1, y1) in zip(pts[:-1], pts[1:])
+    ]
+    return tuple(np.concatenate(col) for col in zip(*parts))
+
+
+def rect_spans(x1, y1, x2, y2):
+    """두 꼭짓점으로 정의된 사각형 내부 ([left, right) x [top, bottom))"""
+    left, right = sorted((int(x1), int(x2)))
+    top, bottom = sorted((int(y1), int(y2)))
+    if right <= left or bottom <= top:
+        return _empty_spans()
+    rows = np.arange(top, bottom)
+    return (
+        rows,
+        np.full(rows.shape, left, dtype=np.intp),
+        np.full(rows.shape, right - 1, dtype=np.intp),
+    )
+
+
+def polygon_spans(points):
+    """
+    닫힌 다각형(올가미) 내부 - even-odd 규칙, 픽셀 중심 기준
+    행마다 변과의 교차점을 정렬해서 (x0, x1), (x2, x3) ... 쌍을 span 으로
+    """
+    pts = np.asarray(points, dtype=float)
+    if len(pts) < 3:
+        return _empty_spans()
+    xa, ya = pts[:, 0], pts[:, 1]
+    xb, yb = np.roll(xa, -1), np.roll(ya, -1)
+
+    top = int(np.floor(ya.min()))
+    bottom = int(np.ceil(ya.max()))
+    rows = np.arange(top, bottom + 1)
+    cy = rows[:, None] + 0.5
+
+    # 반열린 구간 [min(ya, yb), max(ya, yb)) 으로 꼭짓점 중복 교차 방지
+    crosses = (np.minimum(ya, yb) <= cy) & (cy < np.maximum(ya, yb))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = xa + (cy - ya) * (xb - xa) / (yb - ya)
+    x = np.sort(np.where(crosses, x, np.inf), axis=1)
+
+    if x.shape[1] % 2:
+        x = np.concatenate([x, np.full((len(rows), 1), np.inf)], axis=1)
+    x0, x1 = x[:, 0::2], x[:, 1::2]
+    valid = np.isfinite(x1)
+    row_idx = np.broadcast_to(rows[:, None], x0.shape)[valid]
+    xl = np.ceil(x0[valid] - 0.5).astype(np.intp)
+    xr = np.floor(x1[valid] - 0.5).astype(np.intp)
+    return row_idx.astype(np.intp), xl, xr
+
+
+def clip_spans(spans, width: int, height: int):
+    """이미지 범위로 자르고 빈 span 제거"""
+    rows, xl, xr = spans
+    xl = np.maximum(xl, 0)
+    xr = np.minimum(xr, width - 1)
+    keep = (rows >= 0) & (rows < height) & (xl <= xr)
+    return rows[keep], xl[keep], xr[keep]
+
+
+def spans_bbox(spans):
+    """clip 된 span 의 (left, top, right, bottom) - exclusive. 비어있으면 None"""
+    rows, xl, xr = spans
+    if rows.size == 0:
+        return None
+    return int(xl.min()), int(rows.min()), int(xr.max()) + 1, int(rows.max()) + 1
+
+
+def fill_spans(pixels: np.ndarray, spans, value):
+    """clip 된 span 을 value 로 채움 (bool 마스크에도 사용)"""
+    rows, xl, xr = spans
+    if rows.size == 0:
+        return
+    if (
+        (xl == xl[0]).all()
+        and (xr == xr[0]).all()
+        and (rows.size == 1 or (np.diff(rows) == 1).all())
+    ):
+        # 연속된 행에 같은 span → 사각형
+        pixels[rows[0] : rows[-1] + 1, xl[0] : xr[0] + 1] = value
+        return
+
+    lengths = xr - xl + 1
+    total = int(lengths.sum())
+    if total > _FANCY_FILL_LIMIT:
+        for row, left, right in zip(rows.tolist(), xl.tolist(), xr.tolist()):
+            pixels[row, left : right + 1] = value
+        return
+    # span 마다 xl, xl+1, ..., xr 을 이어붙인 열 인덱스
+    starts = np.cumsum(lengths) - lengths
+    cols = np.arange(total) - np.repeat(starts - xl, lengths)
+    pixels[np.repeat(rows, lengths), cols] = value
@@ -0,0 +1,79 @@
+"""
+해상도 변환 (m/px) 용 픽셀 리샘플링
+
+- 축소: 블록 단위 최대값 축소. 장애물이 사라지지 않도록 팔레트 우선순위
+  (boundary > outside > inside) 가 높은 픽셀이 블록을 대표한다.
+- 확대: nearest-neighbour
+
+두 경우 모두 행 단위 청크로 처리해서 전체 크기의 중간 배열을 만들지 않는다.
+"""
+
+import math
+
+import numpy as np
+
+from .palette import class_rank
+
+_EPS = 1e-9
+
+
+def resampled_size(width: int, height: int, scale: float):
+    """scale(= 기존 해상도 / 새 해상도) 적용 후 (width, height)"""
+    new_w = max(1, int(math.ceil(width * scale - _EPS)))
+    new_h = max(1, int(math.ceil(height * scale - _EPS)))
+    return new_w, new_h
+
+
+def _block_starts(count: int, step: float, limit: int) -> np.ndarray:
+    """목적 픽셀 i 가 덮는 원본 구간의 시작 인덱스 (단조 증가)"""
+    starts = np.floor(np.arange(count) * step + _EPS).astype(np.intp)
+    return np.minimum(starts, limit - 1)
+
+
+def _downsample_into(src, dst, step, chunk_rows):
+    h, w = src.shape
+    new_h, new_w = dst.shape
+    row_starts = _block_starts(new_h, step, h)
+    col_starts = _block_starts(new_w, step, w)
+    row_ends = np.append(row_starts[1:], h)
+
+    # 한 청크에 포함할 목적 행 수 (원본 행 chunk_rows 개 정도)
+    rows_per_chunk = max(1, int(chunk_rows // max(step, 1.0)))
+
+    for j0 in range(0, new_h, rows_per_chunk):
+        j1 = min(new_h, j0 + rows_per_chunk)
+        r0, r1 = row_starts[j0], row_ends[j1 - 1]
+        band = src[r0:r1]
+
+        # 상위 32bit 에 우선순위, 하위 32bit 에 원래 픽셀 → max 한 번으로 대표값 선택
+        keys = class_rank(band).astype(np.uint64) << np.uint64(32)
+        keys |= band
+        keys = np.maximum.reduceat(keys, row_starts[j0:j1] - r0, axis=0)
+        keys = np.maximum.reduceat(keys, col_starts, axis=1)
+        dst[j0:j1] = keys & np.uint64(0xFFFFFFFF)
+
+
+def _upsample_into(src, dst, scale, chunk_rows):
+    h, w = src.shape
+    new_h, new_w = dst.shape
+    src_y = np.minimum(((np.arange(new_h) + 0.5) / scale).astype(np.intp), h - 1)
+    src_x = np.minimum(((np.arange(new_w) + 0.5) / scale).astype(np.intp), w - 1)
+
+    for j0 in range(0, new_h, chunk_rows):
+        j1 = min(new_h, j0 + chunk_rows)
+        dst[j0:j1] = src[src_y[j0:j1, None], src_x[None, :]]
+
+
+def resample_into(src: np.ndarray, dst: np.ndarray, scale: float, chunk_rows=256):
+    """
+    src(h, w) uint32 ARGB 배열을 scale 배 해서 dst 에 기록
+    dst 크기는 resampled_size() 결과와 같아야 한다.
+    """
+    if scale <= 0:
+        raise ValueError("scale must be positive")
+    if abs(scale - 1.0) < _EPS:
+        dst[:] = src
+    elif scale < 1.0:
+        _downsample_into(src, dst, 1.0 / scale, chunk_rows)
+    else:
+        _upsample_into(src, dst, scale, chunk_rows)
@@ -0,0 +1,62 @@
+import numpy as np
+from PyQt5.QtCore import QRect
+
+from .pixel_buffer import image_from_array
+
+
+class FloatingSelection:
+    """
+    떠 있는(아직 baseline 에 반영되지 않은) 선택 영역
+    pixels/mask 는 선택 bbox 크기의 작은 배열이다.
+    source 가 있으면 commit 시 원래 자리를 fill 값으로 비운다 (이동).
+    """
+
+    def __init__(self, pixels: np.ndarray, mask: np.ndarray, x: int, y: int):
+        self.pixels = pixels
+        self.mask = mask
+        self.x = x
+        self.y = y
+        self.source = None  # (x, y) - 이동이면 원래 위치
+        self.fill = None
+        self._overlay = None
+        self._hole = None
+
+    def width(self) -> int:
+        return self.pixels.shape[1]
+
+    def height(self) -> int:
+        return self.pixels.shape[0]
+
+    def rect(self) -> QRect:
+        return QRect(self.x, self.y, self.width(), self.height())
+
+    def source_rect(self) -> QRect:
+        if self.source is None:
+            return QRect()
+        return QRect(self.source[0], self.source[1], self.width(), self.height())
+
+    def move_by(self, dx: int, dy: int):
+        self.x += int(dx)
+        self.y += int(dy)
+
+    def contains(self, x, y) -> bool:
+        lx, ly = int(x) - self.x, int(y) - self.y
+        if 0 <= lx < self.width() and 0 <= ly < self.height():
+            return bool(self.mask[ly, lx])
+        return False
+
+    def overlay_image(self):
+        """마스크 밖은 투명한 미리보기 이미지 (한 번만 만듦)"""
+        if self._overlay is None:
+            self._overlay = image_from_array(
+                np.where(self.mask, self.pixels, np.uint32(0))
+            )
+        return self._overlay
+
+    def hole_image(self):
+        """이동 중 원래 자리에 덮어 그릴 fill 색 이미지"""
+        if self._hole is None and self.fill is not None:
+            self._hole = image_from_array(
+                np.where(self.mask, np.uint32(self.fill), np.uint32(0))
+            )
+        return self._hole
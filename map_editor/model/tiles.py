@@ -0,0 +1,35 @@
+"""
+타일 단위 비교 / 순회 도우미
+"""
+
+import numpy as np
+
+DEFAULT_TILE_SIZE = 256
+
+
+def tile_grid(width: int, height: int, tile: int = DEFAULT_TILE_SIZE):
+    """(열 개수, 행 개수)"""
+    return (width + tile - 1) // tile, (height + tile - 1) // tile
+
+
+def tile_rect(tx: int, ty: int, width: int, height: int, tile=DEFAULT_TILE_SIZE):
+    """타일 (tx, ty) 의 (x, y, w, h) - 이미지 가장자리에서 잘림"""
+    x, y = tx * tile, ty * tile
+    return x, y, min(tile, width - x), min(tile, height - y)
+
+
+def changed_tiles(old: np.ndarray, new: np.ndarray, tile: int = DEFAULT_TILE_SIZE):
+    """
+    같은 크기의 두 픽셀 배열에서 내용이 다른 타일 목록 [(tx, ty), ...]
+    타일 행 단위로 비교해서 전체 크기 bool 배열을 만들지 않는다.
+    """
+    if old.shape != new.shape:
+        raise ValueError("changed_tiles() requires arrays of the same shape")
+    h, w = old.shape
+    col_starts = np.arange(0, w, tile)
+    result = []
+    for ty, y0 in enumerate(range(0, h, tile)):
+        diff_cols = (old[y0 : y0 + tile] != new[y0 : y0 + tile]).any(axis=0)
+        tile_diff = np.logical_or.reduceat(diff_cols, col_starts)
+        result.extend((int(tx), ty) for tx in np.flatnonzero(tile_diff))
+    return result
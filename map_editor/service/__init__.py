@@ -0,0 +1 @@
+from .tile_server import TileServer, run_tile_server
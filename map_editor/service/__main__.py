@@ -0,0 +1,24 @@
+import argparse
+
+from .tile_server import run_tile_server
+
+parser = argparse.ArgumentParser(description="Serve map tiles and thumbnails")
+parser.add_argument("maps", nargs="+", help="map image or map YAML files")
+parser.add_argument("--port", type=int, default=8000)
+parser.add_argument("--cache-dir", default=None, help="on-disk tile cache")
+parser.add_argument(
+    "--pregenerate",
+    type=int,
+    action="append",
+    default=[],
+    metavar="LEVEL",
+    help="render all tiles of LEVEL before serving (repeatable)",
+)
+args = parser.parse_args()
+
+run_tile_server(
+    args.maps,
+    port=args.port,
+    cache_dir=args.cache_dir,
+    pregenerate=args.pregenerate,
+)
@@ -0,0 +1,114 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class TileCache:
+    """
+    PNG 타일 캐시 (메모리 LRU + 디스크)
+    키: (맵 내용 해시, 종류, ...) 튜플. 디스크 경로는 cache_dir/<해시>/<나머지 키>.png
+    요청 스레드들이 동시에 쓰므로 디스크 쓰기와 migrate() 는 _disk_lock 으로 직렬화하고,
+    migrate() 로 버린 해시의 늦은 put() 은 무시한다.
+    """
+
+    def __init__(self, cache_dir=None, max_memory_items=2048):
+        self._cache_dir = cache_dir
+        self._max_items = max_memory_items
+        self._memory = OrderedDict()
+        self._retired = set()  # migrate() 로 더 이상 쓰지 않는 해시
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+
+    def _disk_path(self, key):
+        if not self._cache_dir:
+            return None
+        content_hash, *rest = key
+        name = "_".join(str(part) for part in rest) + ".png"
+        return os.path.join(self._cache_dir, content_hash, name)
+
+    def get(self, key):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+
+        path = self._disk_path(key)
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:  # 없거나 migrate() 로 옮겨짐
+            return None
+        self._remember(key, data)
+        return data
+
+    def put(self, key, data: bytes):
+        if not self._remember(key, data):
+            return
+        path = self._disk_path(key)
+        if not path:
+            return
+        with self._disk_lock:
+            if key[0] in self._retired:
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    def _remember(self, key, data) -> bool:
+        """메모리에 저장. 이미 버린 해시면 저장하지 않고 False"""
+        with self._lock:
+            if key[0] in self._retired:
+                return False
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max_items:
+                self._memory.popitem(last=False)
+            return True
+
+    def migrate(self, old_hash: str, new_hash: str, keep):
+        """
+        맵 내용이 바뀌었을 때 old_hash 항목 중 keep(key) 가 True 인 것만
+        new_hash 로 옮기고 나머지는 버림 (바뀐 타일만 무효화)
+        """
+        with self._lock:
+            self._retired.add(old_hash)
+            self._retired.discard(new_hash)  # 예전 내용으로 되돌아온 경우
+            for key in [k for k in self._memory if k[0] == old_hash]:
+                data = self._memory.pop(key)
+                if keep(key):
+                    self._memory[(new_hash,) + key[1:]] = data
+
+        if not self._cache_dir:
+            return
+        old_dir = os.path.join(self._cache_dir, old_hash)
+        new_dir = os.path.join(self._cache_dir, new_hash)
+        with self._disk_lock:
+            try:
+                names = os.listdir(old_dir)
+            except FileNotFoundError:
+                return
+            os.makedirs(new_dir, exist_ok=True)
+            for name in names:
+                src = os.path.join(old_dir, name)
+                try:
+                    if name.endswith(".png") and keep((old_hash,) + _parse_name(name)):
+                        os.replace(src, os.path.join(new_dir, name))
+                    else:
+                        os.remove(src)
+                except FileNotFoundError:
+                    pass
+            try:
+                os.rmdir(old_dir)
+            except OSError:
+                pass  # 다른 프로세스가 쓴 파일이 남았으면 그대로 둠
+
+
+def _parse_name(name: str):
+    """_disk_path() 의 역변환 (정수로 보이는 부분은 int 로)"""
+    parts = name[: -len(".png")].split("_") if name.endswith(".png") else [name]
+    return tuple(int(p) if p.lstrip("-").isdigit() else p for p in parts)
@@ -0,0 +1,315 @@
+"""
+헤드리스 맵 타일 / 썸네일 HTTP 서버 (localhost)
+
+GET /maps                               → 맵 목록 (JSON)
+GET /<map>/info                         → 크기, 해상도, origin, 레벨 수 (JSON)
+GET /<map>/thumbnail.png?size=256       → 썸네일
+GET /<map>/tiles/<level>/<x>/<y>.png    → 타일 (level 0 = 원본, level k = 1/2^k)
+    ?highlight=1 을 붙이면 "Show occupied area" 와 같은 하이라이트 적용
+
+맵 파일이 바뀌면 다음 요청 때 다시 읽고, 실제로 바뀐 타일만 캐시에서 버린다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+
+from ..model import filters
+from ..model.image_model import ImageModel
+from ..model.pixel_buffer import image_from_array, image_view
+from ..model.resample import resample_into, resampled_size
+from ..model.tiles import DEFAULT_TILE_SIZE, changed_tiles, tile_grid
+from .tile_cache import TileCache
+
+
+def _encode_png(img) -> bytes:
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    img.save(buffer, "PNG")
+    buffer.close()
+    return bytes(data)
+
+
+def _file_digest(paths) -> str:
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class MapSource:
+    """서버가 제공하는 맵 하나 (ImageModel 로 로딩, 변경 감지)"""
+
+    def __init__(self, image_path: str, yaml_path: str = None):
+        self.image_path = image_path
+        self.yaml_path = yaml_path
+        self.model = ImageModel()
+        self._stamp = None
+        # (내용 해시, 레벨0 픽셀) - 요청 처리 중 교체되어도 일관되도록 한 번에 바꿈
+        self._snapshot = (None, None)
+        self._lock = threading.Lock()
+
+    def _paths(self):
+        return [p for p in (self.image_path, self.yaml_path) if p]
+
+    def _current_stamp(self):
+        return tuple(
+            (os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in self._paths()
+        )
+
+    def refresh(self):
+        """
+        파일이 바뀌었으면 다시 읽음
+        반환: (이전 해시, 바뀐 레벨0 타일 집합 또는 None=전체) / 변화 없으면 None
+        """
+        with self._lock:
+            stamp = self._current_stamp()
+            if stamp == self._stamp:
+                return None
+            content_hash = _file_digest(self._paths())
+            self._stamp = stamp
+            old_hash, old_pixels = self._snapshot
+            if content_hash == old_hash:
+                return None
+
+            if self.yaml_path:
+                loaded = self.model.import_occupancy_grid(
+                    self.yaml_path, self.image_path
+                )
+            else:
+                loaded = self.model.load_image(self.image_path)
+            if not loaded:
+                raise IOError(f"failed to load map: {self.image_path}")
+
+            pixels = image_view(self.model.get_current_image()).copy()
+            self._snapshot = (content_hash, pixels)
+            if old_pixels is None or old_pixels.shape != pixels.shape:
+                return old_hash, None
+            return old_hash, set(changed_tiles(old_pixels, pixels))
+
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def content_hash(self):
+        return self._snapshot[0]
+
+    def max_level(self, tile=DEFAULT_TILE_SIZE) -> int:
+        h, w = self._snapshot[1].shape
+        level = 0
+        while max(w, h) > tile << level:
+            level += 1
+        return level
+
+    def has_tile(self, level, tx, ty) -> bool:
+        if not 0 <= level <= self.max_level():
+            return False
+        h, w = self._snapshot[1].shape
+        cols, rows = tile_grid(w, h, DEFAULT_TILE_SIZE << level)
+        return 0 <= tx < cols and 0 <= ty < rows
+
+    def info(self) -> dict:
+        content_hash, pixels = self._snapshot
+        h, w = pixels.shape
+        meta = self.model.get_metadata()
+        return {
+            "width": w,
+            "height": h,
+            "resolution": meta.resolution,
+            "origin": meta.origin,
+            "hash": content_hash,
+            "tile_size": DEFAULT_TILE_SIZE,
+            "max_level": self.max_level(),
+        }
+
+
+class TileRenderer:
+    """타일 / 썸네일 PNG 생성 + 캐시"""
+
+    def __init__(self, cache: TileCache, workers=None):
+        self._cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=workers or os.cpu_count())
+
+    def render_tile(self, source: MapSource, level, tx, ty, highlight=False):
+        content_hash, pixels = source.snapshot()
+        key = (content_hash, "tile", int(highlight), level, tx, ty)
+        data = self._cache.get(key)
+        if data is None:
+            data = _encode_png(self._tile_image(pixels, level, tx, ty, highlight))
+            self._cache.put(key, data)
+        return data
+
+    def render_thumbnail(self, source: MapSource, size, highlight=False):
+        content_hash, pixels = source.snapshot()
+        key = (content_hash, "thumb", int(highlight), size)
+        data = self._cache.get(key)
+        if data is None:
+            h, w = pixels.shape
+            scale = min(1.0, size / float(max(w, h)))
+            data = _encode_png(self._reduce(pixels, scale, highlight))
+            self._cache.put(key, data)
+        return data
+
+    def pregenerate(self, source: MapSource, level, highlight=False):
+        """해당 레벨의 모든 타일을 병렬 생성"""
+        h, w = source.snapshot()[1].shape
+        span = DEFAULT_TILE_SIZE << level
+        futures = [
+            self._pool.submit(self.render_tile, source, level, tx, ty, highlight)
+            for ty in range((h + span - 1) // span)
+            for tx in range((w + span - 1) // span)
+        ]
+        for future in futures:
+            future.result()
+
+    def invalidate(self, old_hash, new_hash, changed):
+        """
+        맵 변경 반영. changed 가 None 이면 전부, 아니면 레벨0 변경 타일에
+        겹치는 타일만 버리고 나머지는 새 해시로 옮김. 썸네일은 항상 버림.
+        """
+        if old_hash is None:
+            return
+        changed_by_level = {}
+
+        def keep(key):
+            if changed is None or key[1] != "tile":
+                return False
+            level, tx, ty = key[3:6]
+            if level not in changed_by_level:
+                changed_by_level[level] = {
+                    (cx >> level, cy >> level) for cx, cy in changed
+                }
+            return (tx, ty) not in changed_by_level[level]
+
+        self._cache.migrate(old_hash, new_hash, keep)
+
+    def _tile_image(self, pixels, level, tx, ty, highlight):
+        span = DEFAULT_TILE_SIZE << level
+        region = pixels[ty * span : (ty + 1) * span, tx * span : (tx + 1) * span]
+        return self._reduce(region, 1.0 / (1 << level), highlight)
+
+    @staticmethod
+    def _reduce(region, scale, highlight):
+        h, w = region.shape
+        new_w, new_h = resampled_size(w, h, scale)
+        out = np.empty((new_h, new_w), dtype=np.uint32)
+        resample_into(region, out, scale)
+        if highlight:
+            out = filters.highlight_inside(out)
+        return image_from_array(out)
+
+
+class TileServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, sources: dict, port=8000, cache_dir=None, host="127.0.0.1"):
+        super().__init__((host, port), _TileRequestHandler)
+        self.sources = sources
+        self.renderer = TileRenderer(TileCache(cache_dir))
+        for name in sources:
+            self.get_source(name)
+
+    def get_source(self, name: str):
+        source = self.sources.get(name)
+        if source is None:
+            return None
+        change = source.refresh()
+        if change is not None:
+            old_hash, changed = change
+            self.renderer.invalidate(old_hash, source.content_hash, changed)
+        return source
+
+
+class _TileRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        highlight = query.get("highlight", ["0"])[0] in ("1", "true")
+        parts = [p for p in url.path.split("/") if p]
+
+        try:
+            if parts == ["maps"]:
+                return self._send_json(sorted(self.server.sources))
+            source = self.server.get_source(parts[0]) if parts else None
+            if source is None:
+                return self.send_error(404, "unknown map")
+
+            renderer = self.server.renderer
+            if parts[1:] == ["info"]:
+                return self._send_json(source.info())
+            if parts[1:] == ["thumbnail.png"]:
+                size = max(1, int(query.get("size", ["256"])[0]))
+                return self._send_png(
+                    renderer.render_thumbnail(source, size, highlight)
+                )
+            if len(parts) == 5 and parts[1] == "tiles" and parts[4].endswith(".png"):
+                level, tx = int(parts[2]), int(parts[3])
+                ty = int(parts[4][: -len(".png")])
+                if not source.has_tile(level, tx, ty):
+                    return self.send_error(404, "tile out of range")
+                return self._send_png(
+                    renderer.render_tile(source, level, tx, ty, highlight)
+                )
+        except ValueError:
+            return self.send_error(400, "bad request")
+        except IOError as e:
+            return self.send_error(500, str(e))
+        self.send_error(404)
+
+    def _send_png(self, data: bytes):
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, obj):
+        data = json.dumps(obj).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_tile_server(map_paths, port=8000, cache_dir=None, pregenerate=()):
+    """
+    map_paths: 이미지 또는 map YAML 경로 목록. 이름은 파일명(확장자 제외)
+    pregenerate: 서비스 시작 전에 미리 만들어 둘 타일 레벨 목록
+    """
+    sources = {}
+    for path in map_paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        if path.endswith((".yaml", ".yml")):
+            source = MapSource(None, path)
+            source.model.get_metadata().load_from_yaml(path)
+            source.image_path = source.model.get_metadata().image_path
+        else:
+            source = MapSource(path)
+        sources[name] = source
+
+    server = TileServer(sources, port=port, cache_dir=cache_dir)
+    for level in pregenerate:
+        for name in sorted(sources):
+            print(f"Pregenerating level {level} tiles for {name}...")
+            server.renderer.pregenerate(server.get_source(name), level)
+    print(f"Serving map tiles on http://127.0.0.1:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
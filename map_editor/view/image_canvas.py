@@ -1,12 +1,15 @@
+import math
+
 from ..viewmodel import ImageViewModel
-from PyQt5.QtGui import QPainter, QPen
+from PyQt5.QtGui import QColor, QPainter, QPen, QPolygonF
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QLineF, QPointF, QRect, QRectF, pyqtSignal
 
 
 class ImageCanvas(QWidget):
     # pointerMoved = pyqtSignal(int, int)  # x, y 좌표 전달 시그널
     pointerMoved = pyqtSignal(int, int, str)
+    pathChecked = pyqtSignal(object)  # 경로 [(x, y), ...] 또는 None (도달 불가)
 
     def __init__(self, view_model: ImageViewModel, parent=None):
         super().__init__(parent)
@@ -18,7 +21,30 @@ class ImageCanvas(QWidget):
 
         self._line_start = None  # 선 모드
         self._rect_start = None  # 사각형 모드
-        self._mouse_pos = None
+
+        # 선택 모드
+        self._selection_rect = None  # 이미지 좌표 QRect
+        self._lasso_points = None  # 올가미 꼭짓점 [(x, y), ...]
+        self._selecting = False
+        self._select_start = None
+        self._floating = None  # FloatingSelection (이동/붙여넣기 중)
+        self._move_last = None
+
+        # 경로 확인 모드
+        self._path_start = None
+        self._path_goal = None
+        self._path = None  # 마지막 결과 경로 (QPolygonF)
+
+        # 라이다 미리보기: 왼쪽 드래그 = 위치, 오른쪽 드래그 = 방향
+        self._lidar_drag = None  # None / "move" / "rotate"
+        self._lidar_scan = None  # 그리기용으로 변환한 스캔 (view model 결과 기준)
+        self._lidar_shapes = None
+
+        # 커서 / 미리보기 캐시
+        self._hover_pixel = None  # 커서가 올라가 있는 맵 픽셀 (x, y)
+        self._preview_rect = QRect()  # 마지막으로 그린 미리보기 영역 (위젯 좌표)
+        self._pens = {}  # (종류, 굵기) → QPen, 배율이 바뀌면 비움
+        self._pens_scale = None
 
         self._scale_factor = 1.0
         self._translate_x = 0
@@ -37,13 +63,15 @@ class ImageCanvas(QWidget):
 
         current_img = self.view_model.get_current_image()
         if not current_img.isNull():
-            painter.drawImage(0, 0, current_img)
+            # 다시 그려야 하는 영역(event.rect())에 해당하는 부분만 그림
+            inverse, _ = painter.transform().inverted()
+            exposed = inverse.mapRect(QRectF(event.rect())).toAlignedRect()
+            exposed = exposed.adjusted(-1, -1, 1, 1).intersected(current_img.rect())
+            if not exposed.isEmpty():
+                painter.drawImage(exposed, current_img, exposed)
         else:
             painter.fillRect(self.rect(), Qt.gray)
 
-        meta = self.view_model.get_metadata()
-        origin_pos = meta.get_origin_pixel_position()
-
         if self.view_model.get_show_origin():
             meta = self.view_model.get_metadata()
             origin_pos = meta.get_origin_pixel_position()
@@ -60,86 +88,362 @@ class ImageCanvas(QWidget):
                     painter.setPen(QPen(Qt.blue, 2))
                     painter.drawLine(*y_axis)
 
-        # --- 모드별 프리뷰 ---
-        if self.view_model.is_line_mode():
-            if self._line_start is None:
-                # 첫 클릭 전: 브러시 미리보기처럼 표시?
-                if self._mouse_pos:
-                    self._draw_brush_preview(painter)
-            else:
-                # 첫 클릭 후 -> 선 프리뷰
-                if self._mouse_pos:
-                    self._draw_line_preview(painter)
-
-        elif self.view_model.is_rect_mode():
-            if self._rect_start is None:
-                # 첫 클릭 전 -> 브러시 미리보기
-                if self._mouse_pos:
-                    self._draw_brush_preview(painter)
-            else:
-                # 첫 클릭 후 -> 사각형 테두리 표시
-                if self._mouse_pos:
-                    self._draw_rectangle_preview(painter)
+        self._draw_selection_overlay(painter)
+        self._draw_path_overlay(painter)
+        self._draw_lidar_overlay(painter)
 
-        else:
-            # 브러시 모드
-            if self._mouse_pos:
-                self._draw_brush_preview(painter)
+        # --- 모드별 프리뷰 ---
+        kind, rect = self._preview_shape()
+        if kind == "brush":
+            painter.setPen(self._pen("outline"))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(rect)
+        elif kind == "line":
+            painter.setPen(self._pen("line"))
+            (sx, sy), (ex, ey) = self._line_start, self._hover_center()
+            painter.drawLine(int(sx), int(sy), int(ex), int(ey))
+        elif kind == "rect":
+            painter.setPen(self._pen("outline"))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(rect)
+        # 다음 커서 이동 때 이 영역만 지우고 다시 그림
+        self._preview_rect = self._widget_rect(rect) if kind else QRect()
 
         painter.restore()
         painter.end()
 
-    def _draw_brush_preview(self, painter: QPainter):
-        brush_size = self.view_model.get_draw_thickness()
-        half = brush_size / 2.0
-        if not self._mouse_pos:
-            return
-        cx = (self._mouse_pos.x() - self._translate_x) / self._scale_factor
-        cy = (self._mouse_pos.y() - self._translate_y) / self._scale_factor
+    def _pen(self, kind: str) -> QPen:
+        """미리보기용 pen. 굵기/확대 배율별로 한 번만 만듦"""
+        if self._pens_scale != self._scale_factor:
+            self._pens.clear()
+            self._pens_scale = self._scale_factor
+        thickness = self.view_model.get_draw_thickness()
+        pen = self._pens.get((kind, thickness))
+        if pen is None:
+            if kind == "line":
+                pen = QPen(Qt.blue, thickness, Qt.SolidLine, Qt.SquareCap, Qt.MiterJoin)
+            elif kind == "hit":
+                pen = QPen(Qt.red, 3 / self._scale_factor)
+            elif kind == "pose":
+                pen = QPen(Qt.green, 6 / self._scale_factor)
+            else:
+                pen = QPen(Qt.blue, 1, Qt.SolidLine)
+            self._pens[(kind, thickness)] = pen
+        return pen
+
+    def _hover_center(self):
+        """커서가 올라간 맵 픽셀의 중심 (이미지 좌표)"""
+        px, py = self._hover_pixel
+        return px + 0.5, py + 0.5
+
+    def _preview_shape(self):
+        """
+        현재 모드의 미리보기 (종류, 이미지 좌표 bounding QRect)
+        종류: None / "brush" / "line" / "rect"
+        """
+        if self._hover_pixel is None or (
+            self.view_model.get_select_mode()
+            or self.view_model.is_path_mode()
+            or self.view_model.is_lidar_mode()
+        ):
+            # 선택/경로/라이다 모드는 브러시 미리보기 없이 overlay 만 표시
+            return None, QRect()
+
+        thickness = self.view_model.get_draw_thickness()
+        ex, ey = self._hover_center()
+        if self.view_model.is_line_mode() and self._line_start is not None:
+            # 첫 클릭 후 -> 선 프리뷰 (pen 굵기만큼 여유)
+            sx, sy = self._line_start
+            rect = QRect(
+                int(min(sx, ex)), int(min(sy, ey)), int(abs(ex - sx)), int(abs(ey - sy))
+            )
+            return "line", rect.adjusted(-thickness, -thickness, thickness, thickness)
+        if self.view_model.is_rect_mode() and self._rect_start is not None:
+            # 첫 클릭 후 -> 사각형 테두리 표시
+            sx, sy = self._rect_start
+            left, top = min(sx, ex), min(sy, ey)
+            right, bottom = max(sx, ex), max(sy, ey)
+            return "rect", QRect(
+                int(left), int(top), int(right - left), int(bottom - top)
+            )
+
+        # 브러시 모드 / 선·사각형 첫 클릭 전 -> 사각형 브러시 미리보기
+        half = thickness / 2.0
+        return "brush", QRect(int(ex - half), int(ey - half), thickness, thickness)
+
+    def _widget_rect(self, rect: QRect) -> QRect:
+        """이미지 좌표 rect → 위젯 좌표 (테두리 pen 두께만큼 여유)"""
+        s = self._scale_factor
+        return QRect(
+            int(self._translate_x + rect.x() * s) - 2,
+            int(self._translate_y + rect.y() * s) - 2,
+            int((rect.width() + 1) * s) + 4,
+            int((rect.height() + 1) * s) + 4,
+        )
 
-        pen = QPen(Qt.blue, 1, Qt.SolidLine)
+    def _refresh_preview(self, dirty: QRect = None):
+        """이전/현재 미리보기 영역 (+ 이미지가 바뀐 영역) 만 다시 그리도록 요청"""
+        region = self._preview_rect
+        kind, rect = self._preview_shape()
+        if kind:
+            region = region.united(self._widget_rect(rect))
+        if dirty is not None and not dirty.isEmpty():
+            region = region.united(self._widget_rect(dirty))
+        if not region.isEmpty():
+            self.update(region)
+
+    def _draw_selection_overlay(self, painter: QPainter):
+        """떠 있는 선택 영역 + 선택 테두리 (commit 전까지는 overlay 로만 그림)"""
+        floating = self._floating
+        if floating is not None:
+            hole = floating.hole_image()
+            if hole is not None:
+                painter.drawImage(floating.source[0], floating.source[1], hole)
+            painter.drawImage(floating.x, floating.y, floating.overlay_image())
+
+        pen = QPen(Qt.blue, 0, Qt.DashLine)  # cosmetic: 확대와 무관하게 1px
         painter.setPen(pen)
         painter.setBrush(Qt.NoBrush)
-        # 사각형 브러시 미리보기
-        painter.drawRect(
-            int(cx - half), int(cy - half), int(brush_size), int(brush_size)
-        )
+        if floating is not None:
+            painter.drawRect(floating.rect())
+        elif self._lasso_points:
+            polygon = QPolygonF([QPointF(x, y) for x, y in self._lasso_points])
+            if self._selecting:
+                painter.drawPolyline(polygon)
+            else:
+                painter.drawPolygon(polygon)
+        elif self._selection_rect is not None:
+            painter.drawRect(self._selection_rect)
+
+    def _draw_path_overlay(self, painter: QPainter):
+        """경로 확인 결과: 경로(초록) / 도달 불가(빨간 점선) + 시작/목표 점"""
+        if self._path_start is None:
+            return
+        start = QPointF(self._path_start[0] + 0.5, self._path_start[1] + 0.5)
+        goal = None
+        if self._path_goal is not None:
+            goal = QPointF(self._path_goal[0] + 0.5, self._path_goal[1] + 0.5)
+
+        if self._path is not None:
+            painter.setPen(QPen(Qt.green, 0))  # cosmetic
+            painter.setBrush(Qt.NoBrush)
+            painter.drawPolyline(self._path)
+        elif goal is not None:
+            painter.setPen(QPen(Qt.red, 0, Qt.DashLine))
+            painter.drawLine(start, goal)
+
+        painter.setPen(QPen(Qt.green, 6))
+        painter.drawPoint(start)
+        if goal is not None:
+            painter.setPen(QPen(Qt.green if self._path is not None else Qt.red, 6))
+            painter.drawPoint(goal)
+
+    def _path_press(self, x, y):
+        """첫 클릭: 시작점, 두 번째 클릭: 목표점 → 경로 계산"""
+        if self._path_start is None or self._path_goal is not None:
+            self._path_start = (x, y)
+            self._path_goal = None
+            self._path = None
+            return
+        self._path_goal = (x, y)
+        path = self.view_model.plan_path(self._path_start, self._path_goal)
+        if path is not None:
+            # 픽셀 중심을 지나도록
+            self._path = QPolygonF([QPointF(px + 0.5, py + 0.5) for px, py in path])
+        self.pathChecked.emit(path)
+
+    def clear_path(self):
+        self._path_start = None
+        self._path_goal = None
+        self._path = None
+        self.update()
 
-    def _draw_line_preview(self, painter: QPainter):
-        pen = QPen(
-            Qt.blue,
-            self.view_model.get_draw_thickness(),
-            Qt.SolidLine,
-            Qt.SquareCap,
-            Qt.MiterJoin,
+    def _draw_lidar_overlay(self, painter: QPainter):
+        """시뮬레이션 스캔: 빔(반투명) + 장애물에 닿은 점(빨강) + pose 화살표"""
+        pose = self.view_model.get_lidar_pose()
+        if pose is None:
+            return
+        scan = self.view_model.get_lidar_scan()
+        if scan is not self._lidar_scan:
+            # 스캔이 다시 계산됐을 때만 QLineF / QPolygonF 새로 만듦
+            ends, hit = scan
+            x, y, _ = pose
+            origin = QPointF(x, y)
+            lines = [QLineF(origin, QPointF(ex, ey)) for ex, ey in ends.tolist()]
+            points = QPolygonF([QPointF(ex, ey) for ex, ey in ends[hit].tolist()])
+            self._lidar_shapes = (lines, points)
+            self._lidar_scan = scan
+        lines, points = self._lidar_shapes
+
+        painter.setPen(QPen(QColor(255, 165, 0, 60), 0))
+        painter.drawLines(lines)
+        painter.setPen(self._pen("hit"))
+        painter.drawPoints(points)
+
+        x, y, heading = pose
+        length = 20 / self._scale_factor
+        painter.setPen(QPen(Qt.green, 0))
+        painter.drawLine(
+            QPointF(x, y),
+            QPointF(x + math.cos(heading) * length, y - math.sin(heading) * length),
         )
-        painter.setPen(pen)
-        sx, sy = self._line_start
-        ex = (self._mouse_pos.x() - self._translate_x) / self._scale_factor
-        ey = (self._mouse_pos.y() - self._translate_y) / self._scale_factor
-        painter.drawLine(int(sx), int(sy), int(ex), int(ey))
+        painter.setPen(self._pen("pose"))
+        painter.drawPoint(QPointF(x, y))
+
+    def _lidar_press(self, button, x, y):
+        if button == Qt.LeftButton:
+            self._lidar_drag = "move"
+            self.view_model.set_lidar_pose(x, y)
+        elif button == Qt.RightButton and self.view_model.get_lidar_pose():
+            self._lidar_drag = "rotate"
+            self._lidar_move(x, y)
+
+    def _lidar_move(self, x, y):
+        if self._lidar_drag == "move":
+            self.view_model.set_lidar_pose(x, y)
+        elif self._lidar_drag == "rotate":
+            px, py, _ = self.view_model.get_lidar_pose()
+            if (x, y) != (px, py):
+                # 이미지 y 는 아래 방향이므로 반전
+                self.view_model.set_lidar_pose(px, py, math.atan2(py - y, x - px))
+
+    def clear_lidar(self):
+        self.view_model.clear_lidar_pose()
+        self._lidar_drag = None
+        self._lidar_scan = None
+        self._lidar_shapes = None
+        self.update()
 
-    def _draw_rectangle_preview(self, painter: QPainter):
-        pen = QPen(Qt.blue, 1, Qt.SolidLine)
-        painter.setPen(pen)
-        painter.setBrush(Qt.NoBrush)
+    def _selection_contains(self, x, y) -> bool:
+        if self._lasso_points:
+            polygon = QPolygonF([QPointF(px, py) for px, py in self._lasso_points])
+            return polygon.containsPoint(QPointF(x, y), Qt.OddEvenFill)
+        if self._selection_rect is not None:
+            return self._selection_rect.contains(int(x), int(y))
+        return False
+
+    def _selection_args(self):
+        """view model 선택 API 인자 (rect, polygon)"""
+        if self._lasso_points:
+            polygon = QPolygonF([QPointF(x, y) for x, y in self._lasso_points])
+            return polygon.boundingRect().toAlignedRect(), self._lasso_points
+        return self._selection_rect, None
+
+    def selection_bounds(self):
+        """선택 영역의 bounding QRect (이미지 좌표, 선택이 없으면 None)"""
+        if self._floating is not None:
+            return self._floating.rect()
+        if self.has_selection():
+            return self._selection_args()[0]
+        return None
+
+    def has_selection(self) -> bool:
+        return self._selection_rect is not None or bool(self._lasso_points)
+
+    def clear_selection(self):
+        self._selection_rect = None
+        self._lasso_points = None
+        self._selecting = False
+        self._move_last = None
+
+    def commit_selection(self):
+        """떠 있는 선택 영역을 이미지에 반영"""
+        if self._floating is not None:
+            self.view_model.commit_selection(self._floating)
+            self._floating = None
+        self.clear_selection()
+        self.update()
+
+    def cancel_selection(self):
+        """떠 있는 선택 영역 버림 (이미지는 그대로)"""
+        self._floating = None
+        self.clear_selection()
+        self.update()
+
+    def copy_selection(self):
+        if self._floating is None and self.has_selection():
+            self.view_model.copy_selection(*self._selection_args())
 
-        sx, sy = self._rect_start
-        ex = (self._mouse_pos.x() - self._translate_x) / self._scale_factor
-        ey = (self._mouse_pos.y() - self._translate_y) / self._scale_factor
+    def cut_selection(self):
+        if self._floating is None and self.has_selection():
+            self.view_model.cut_selection(*self._selection_args())
+            self.clear_selection()
+            self.update()
+
+    def paste_selection(self):
+        floating = self.view_model.paste_selection()
+        if floating is None:
+            return
+        self.commit_selection()
+        self._floating = floating
+        self.update()
 
-        left = min(sx, ex)
-        right = max(sx, ex)
-        top = min(sy, ey)
-        bottom = max(sy, ey)
+    def _select_press(self, x, y):
+        if self._floating is not None and self._floating.contains(x, y):
+            self._move_last = (x, y)
+            return
+        if self._floating is None and self._selection_contains(x, y):
+            self._floating = self.view_model.lift_selection(*self._selection_args())
+            if self._floating is not None:
+                self._move_last = (x, y)
+                return
 
-        painter.drawRect(int(left), int(top), int(right - left), int(bottom - top))
+        # 새 선택 시작
+        self.commit_selection()
+        self._selecting = True
+        self._select_start = (x, y)
+        if self.view_model.get_select_mode() == "lasso":
+            self._lasso_points = [(x, y)]
+        else:
+            self._selection_rect = QRect(x, y, 1, 1)
+
+    def _select_move(self, x, y):
+        if self._move_last is not None and self._floating is not None:
+            self._floating.move_by(x - self._move_last[0], y - self._move_last[1])
+            self._move_last = (x, y)
+        elif self._selecting:
+            if self._lasso_points is not None:
+                if self._lasso_points[-1] != (x, y):
+                    self._lasso_points.append((x, y))
+            else:
+                sx, sy = self._select_start
+                self._selection_rect = QRect(
+                    min(sx, x), min(sy, y), abs(x - sx) + 1, abs(y - sy) + 1
+                )
+
+    def _select_release(self):
+        self._move_last = None
+        if self._selecting:
+            self._selecting = False
+            if self._lasso_points is not None and len(self._lasso_points) < 3:
+                self._lasso_points = None
 
     def mousePressEvent(self, event):
+        if self.view_model.is_lidar_mode():
+            self._lidar_press(
+                event.button(),
+                (event.x() - self._translate_x) / self._scale_factor,
+                (event.y() - self._translate_y) / self._scale_factor,
+            )
+            self.update()
+            return
+
         if event.button() == Qt.LeftButton:
             x_unscaled = (event.x() - self._translate_x) / self._scale_factor
             y_unscaled = (event.y() - self._translate_y) / self._scale_factor
 
+            # --- 선택 모드 ---
+            if self.view_model.get_select_mode():
+                self._select_press(int(x_unscaled), int(y_unscaled))
+                self.update()
+                return
+
+            # --- 경로 확인 모드 ---
+            if self.view_model.is_path_mode():
+                self._path_press(int(x_unscaled), int(y_unscaled))
+                self.update()
+                return
+
             # --- 선 모드 ---
             if self.view_model.is_line_mode():
                 if self._line_start is None:
@@ -172,10 +476,12 @@ class ImageCanvas(QWidget):
             self.update()
 
     def mouseMoveEvent(self, event):
-        self._mouse_pos = event.pos()
-
         px = int((event.x() - self._translate_x) / self._scale_factor)
         py = int((event.y() - self._translate_y) / self._scale_factor)
+        if (px, py) == self._hover_pixel:
+            # 같은 맵 픽셀 안에서 움직이면 라벨/미리보기/그리기 모두 그대로
+            return
+        self._hover_pixel = (px, py)
 
         meta = self.view_model.get_metadata()
         if self.view_model.get_show_coords() and meta and meta.origin:
@@ -190,19 +496,48 @@ class ImageCanvas(QWidget):
 
         self.pointerMoved.emit(px, py, label)
 
+        if self.view_model.get_select_mode():
+            if self._selecting or self._move_last is not None:
+                self._select_move(px, py)
+                self.update()
+
+        elif self.view_model.is_lidar_mode():
+            if self._lidar_drag is not None:
+                self._lidar_move(
+                    (event.x() - self._translate_x) / self._scale_factor,
+                    (event.y() - self._translate_y) / self._scale_factor,
+                )
+                self.update()
+
         # 브러시 드래그
-        if (not self.view_model.is_line_mode()) and (
+        elif (not self.view_model.is_line_mode()) and (
             not self.view_model.is_rect_mode()
         ):
+            dirty = None
             if self._drawing_brush:
-                self.view_model.draw_brush(px, py, self._prev_x, self._prev_y)
+                dirty = self.view_model.draw_brush(px, py, self._prev_x, self._prev_y)
                 self._prev_x = px
                 self._prev_y = py
+            if dirty is not None and self.view_model.get_lidar_pose() is not None:
+                # 벽이 바뀌면 스캔 전체가 바뀔 수 있음
+                self.update()
+            else:
+                self._refresh_preview(dirty)
 
-        self.update()
+        else:
+            self._refresh_preview()
 
     def mouseReleaseEvent(self, event):
+        if self.view_model.is_lidar_mode():
+            self._lidar_drag = None
+            return
+
         if event.button() == Qt.LeftButton:
+            if self.view_model.get_select_mode():
+                self._select_release()
+                self.update()
+                return
+
             # 브러시 모드 드래그 종료
             if (not self.view_model.is_line_mode()) and (
                 not self.view_model.is_rect_mode()
@@ -247,14 +582,28 @@ class ImageCanvas(QWidget):
                 else:
                     self._translate_y -= 50
 
+        # 화면이 움직였으니 커서 아래 맵 픽셀 다시 계산
+        self._hover_pixel = (
+            int((event.x() - self._translate_x) / self._scale_factor),
+            int((event.y() - self._translate_y) / self._scale_factor),
+        )
         self.update()
 
+    def update_image_rect(self, rect):
+        """이미지 좌표계의 rect 영역만 다시 그림"""
+        if self.view_model.get_lidar_pose() is not None:
+            self.update()
+        else:
+            self.update(self._widget_rect(rect))
+
     def set_translate_x(self, value: int):
         self._translate_x = value
+        self._hover_pixel = None
         self.update()
 
     def set_translate_y(self, value: int):
         self._translate_y = value
+        self._hover_pixel = None
         self.update()
 
     def keyPressEvent(self, event):
@@ -264,4 +613,11 @@ class ImageCanvas(QWidget):
                 self._line_start = None
             if self._rect_start is not None:
                 self._rect_start = None
+            # Drop floating selection / selection
+            self.cancel_selection()
+            self.clear_path()
+            if self.view_model.is_lidar_mode():
+                self.clear_lidar()
             self.update()
+        elif event.key() in (Qt.Key_Return, Qt.Key_Enter):
+            self.commit_selection()
@@ -1,3 +1,5 @@
+import os
+
 from ..viewmodel import ImageViewModel
 from PyQt5.QtWidgets import (
     QMainWindow,
@@ -12,17 +14,28 @@ from PyQt5.QtWidgets import (
     QFileDialog,
     QShortcut,
     QMessageBox,  # Add import for QMessageBox
+    QInputDialog,
 )
 from .image_canvas import ImageCanvas
+from ..model import palette
+from ..model.map_metadata import MapMetadataError
+from ..model.morphology import KERNEL_SHAPES
 from PyQt5.QtGui import QKeySequence, QColor
 from PyQt5.QtCore import Qt
 
+PALETTE_CLASSES = {
+    "Outside (#000000)": palette.OUTSIDE,
+    "Inside (#010101)": palette.INSIDE,
+    "Boundary (#FFFFFF)": palette.BOUNDARY,
+}
+
 
 class MainWindow(QMainWindow):
     def __init__(self, view_model: ImageViewModel):
         super().__init__()
         self.view_model = view_model
         self.init_ui()
+        self.view_model.set_progress_callback(self.on_progress)
 
     def init_ui(self):
         self.setWindowTitle("Map editor")
@@ -37,6 +50,7 @@ class MainWindow(QMainWindow):
 
         self.canvas = ImageCanvas(self.view_model, parent=self)
         self.canvas.pointerMoved.connect(self.update_pointer_label)
+        self.canvas.pathChecked.connect(self.on_path_checked)
 
         # Ctrl+Z -> Undo 단축키
         undo_shortcut = QShortcut(QKeySequence("Ctrl+Z"), self)
@@ -70,16 +84,28 @@ class MainWindow(QMainWindow):
         self.radio_brush = QRadioButton("Brush")
         self.radio_line = QRadioButton("Line")
         self.radio_rect = QRadioButton("Rectangle")
+        self.radio_select = QRadioButton("Select (Rect)")
+        self.radio_lasso = QRadioButton("Select (Lasso)")
+        self.radio_path = QRadioButton("Path Check")
+        self.radio_lidar = QRadioButton("Lidar Preview")
 
         self.radio_brush.setChecked(True)  # 기본 브러시
         mode_group = QButtonGroup()
         mode_group.addButton(self.radio_brush)
         mode_group.addButton(self.radio_line)
         mode_group.addButton(self.radio_rect)
+        mode_group.addButton(self.radio_select)
+        mode_group.addButton(self.radio_lasso)
+        mode_group.addButton(self.radio_path)
+        mode_group.addButton(self.radio_lidar)
 
         self.radio_brush.toggled.connect(self.on_mode_changed)
         self.radio_line.toggled.connect(self.on_mode_changed)
         self.radio_rect.toggled.connect(self.on_mode_changed)
+        self.radio_select.toggled.connect(self.on_mode_changed)
+        self.radio_lasso.toggled.connect(self.on_mode_changed)
+        self.radio_path.toggled.connect(self.on_mode_changed)
+        self.radio_lidar.toggled.connect(self.on_mode_changed)
 
         # 평행 이동 슬라이더
         self.translate_x_slider = QSlider(Qt.Horizontal)
@@ -106,6 +132,10 @@ class MainWindow(QMainWindow):
         right_layout.addWidget(self.radio_brush)
         right_layout.addWidget(self.radio_line)
         right_layout.addWidget(self.radio_rect)
+        right_layout.addWidget(self.radio_select)
+        right_layout.addWidget(self.radio_lasso)
+        right_layout.addWidget(self.radio_path)
+        right_layout.addWidget(self.radio_lidar)
 
         right_layout.addWidget(self.pointer_label)
         right_layout.addWidget(self.image_size_label)
@@ -138,6 +168,31 @@ class MainWindow(QMainWindow):
         open_action.triggered.connect(self.open_file)
         file_menu.addAction(open_action)
 
+        import_grid_action = QAction("Import Occupancy Map (YAML)", self)
+        import_grid_action.triggered.connect(self.on_import_occupancy_grid)
+        file_menu.addAction(import_grid_action)
+
+        self.follow_file_action = QAction("Follow File", self, checkable=True)
+        self.follow_file_action.setChecked(False)
+        self.follow_file_action.triggered.connect(self.toggle_follow_file)
+        file_menu.addAction(self.follow_file_action)
+        follower = self.view_model.get_file_follower()
+        follower.aboutToReload.connect(self._settle_selection)
+        follower.followingChanged.connect(self.follow_file_action.setChecked)
+        follower.reloaded.connect(self.on_file_reloaded)
+
+        merge_action = QAction("Merge Maps (YAML)...", self)
+        merge_action.triggered.connect(self.on_merge_maps)
+        file_menu.addAction(merge_action)
+
+        open_project_action = QAction("Open Project", self)
+        open_project_action.triggered.connect(self.open_project)
+        file_menu.addAction(open_project_action)
+
+        save_project_action = QAction("Save Project", self)
+        save_project_action.triggered.connect(self.save_project)
+        file_menu.addAction(save_project_action)
+
         save_action = QAction("Save", self)
         save_action.triggered.connect(self.save_file)
         file_menu.addAction(save_action)
@@ -152,14 +207,29 @@ class MainWindow(QMainWindow):
 
         edit_menu = menubar.addMenu("Edit")
 
+        copy_action = QAction("Copy", self)
+        copy_action.setShortcut(QKeySequence.Copy)
+        copy_action.triggered.connect(self.canvas.copy_selection)
+        edit_menu.addAction(copy_action)
+
+        cut_action = QAction("Cut", self)
+        cut_action.setShortcut(QKeySequence.Cut)
+        cut_action.triggered.connect(self.on_cut)
+        edit_menu.addAction(cut_action)
+
+        paste_action = QAction("Paste", self)
+        paste_action.setShortcut(QKeySequence.Paste)
+        paste_action.triggered.connect(self.canvas.paste_selection)
+        edit_menu.addAction(paste_action)
+
         invert_action = QAction("Invert Colors", self)
         invert_action.triggered.connect(self.on_invert)
         edit_menu.addAction(invert_action)
 
-        highlight_action = QAction("Show occupied area", self, checkable=True)
-        highlight_action.setChecked(False)
-        highlight_action.triggered.connect(self.toggle_highlight)
-        edit_menu.addAction(highlight_action)
+        self.highlight_action = QAction("Show occupied area", self, checkable=True)
+        self.highlight_action.setChecked(False)
+        self.highlight_action.triggered.connect(self.toggle_highlight)
+        edit_menu.addAction(self.highlight_action)
 
         # 회전 메뉴 (시계/반시계)
         rotate_cw_action = QAction("Rotate Clockwise", self)
@@ -170,25 +240,51 @@ class MainWindow(QMainWindow):
         rotate_ccw_action.triggered.connect(self.on_rotate_counterclockwise)
         edit_menu.addAction(rotate_ccw_action)
 
+        resample_action = QAction("Resample...", self)
+        resample_action.triggered.connect(self.on_resample)
+        edit_menu.addAction(resample_action)
+
+        auto_crop_action = QAction("Auto Crop...", self)
+        auto_crop_action.triggered.connect(self.on_auto_crop)
+        edit_menu.addAction(auto_crop_action)
+
+        pad_action = QAction("Pad...", self)
+        pad_action.triggered.connect(self.on_pad)
+        edit_menu.addAction(pad_action)
+
+        cleanup_action = QAction("Cleanup Noise...", self)
+        cleanup_action.triggered.connect(self.on_cleanup)
+        edit_menu.addAction(cleanup_action)
+
         tool_menu = menubar.addMenu("Tools")
         import_meta_action = QAction("Import Meta File", self)
         import_meta_action.triggered.connect(self.on_import_metadata)
         tool_menu.addAction(import_meta_action)
 
-        show_origin_action = QAction("Show Origin", self, checkable=True)
-        show_origin_action.setChecked(False)
-        show_origin_action.triggered.connect(self.toggle_show_origin)
-        tool_menu.addAction(show_origin_action)
+        self.show_origin_action = QAction("Show Origin", self, checkable=True)
+        self.show_origin_action.setChecked(False)
+        self.show_origin_action.triggered.connect(self.toggle_show_origin)
+        tool_menu.addAction(self.show_origin_action)
+
+        self.show_coord_action = QAction("Show Coordinate", self, checkable=True)
+        self.show_coord_action.setChecked(False)
+        self.show_coord_action.triggered.connect(self.toggle_show_coords)
+        tool_menu.addAction(self.show_coord_action)
 
-        show_coord_action = QAction("Show Coordinate", self, checkable=True)
-        show_coord_action.setChecked(False)
-        show_coord_action.triggered.connect(self.toggle_show_coords)
-        tool_menu.addAction(show_coord_action)
+        path_settings_action = QAction("Path Check Settings...", self)
+        path_settings_action.triggered.connect(self.on_path_settings)
+        tool_menu.addAction(path_settings_action)
+
+        lidar_settings_action = QAction("Lidar Settings...", self)
+        lidar_settings_action.triggered.connect(self.on_lidar_settings)
+        tool_menu.addAction(lidar_settings_action)
 
     # ---------------------------
     #  (A) Undo
     # ---------------------------
     def on_undo(self):
+        # 떠 있는 선택 영역은 먼저 반영해서 undo 대상이 되게 함
+        self._settle_selection()
         self.view_model.undo()
         self.update_image_info()
         self.canvas.update()
@@ -204,6 +300,7 @@ class MainWindow(QMainWindow):
             "Images (*.png *.pgm);;All Files (*.*)",
         )
         if path:
+            self._settle_selection(commit=False)
             if self.view_model.open_image(path):
                 img = self.view_model.get_current_image()
                 if not img.isNull():
@@ -211,18 +308,130 @@ class MainWindow(QMainWindow):
                 self.update_image_info()
                 self.canvas.update()
 
+    def on_import_occupancy_grid(self):
+        yaml_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Occupancy Map", "", "YAML Files (*.yaml *.yml)"
+        )
+        if not yaml_path:
+            return
+        self._settle_selection(commit=False)
+        histogram = self.view_model.import_occupancy_grid(yaml_path)
+        if histogram is None:
+            # YAML 에 image 가 없거나 찾을 수 없으면 직접 선택
+            image_path, _ = QFileDialog.getOpenFileName(
+                self,
+                "Open Map Image",
+                "",
+                "Images (*.png *.pgm);;All Files (*.*)",
+            )
+            if not image_path:
+                return
+            histogram = self.view_model.import_occupancy_grid(yaml_path, image_path)
+            if histogram is None:
+                print("Failed to import occupancy map.")
+                return
+
+        self._on_image_resized()
+        total = max(1, sum(histogram.values()))
+        lines = [
+            f"{name}: {count} px ({count * 100.0 / total:.1f}%)"
+            for name, count in histogram.items()
+        ]
+        QMessageBox.information(self, "Import Occupancy Map", "\n".join(lines))
+
+    def on_merge_maps(self):
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Merge Maps", "", "YAML Files (*.yaml *.yml)"
+        )
+        if len(paths) < 2:
+            return
+        # "Newest wins" 는 파일 수정 시각 기준 (오래된 것부터)
+        paths.sort(key=os.path.getmtime)
+        rules = {"Obstacle wins": "obstacle", "Newest wins": "newest"}
+        name, ok = QInputDialog.getItem(
+            self, "Merge Maps", "Overlap rule:", list(rules), 0, False
+        )
+        if not ok:
+            return
+        out_yaml, _ = QFileDialog.getSaveFileName(
+            self, "Save Merged Map", "", "YAML Files (*.yaml)"
+        )
+        if not out_yaml:
+            return
+        if not out_yaml.endswith((".yaml", ".yml")):
+            out_yaml += ".yaml"
+
+        meta = self.view_model.merge_maps(paths, out_yaml, rules[name])
+        if meta is None:
+            QMessageBox.warning(self, "Merge Maps", "Failed to merge maps.")
+            return
+        reply = QMessageBox.question(
+            self,
+            "Merge Maps",
+            f"Saved {meta.image_path}\nOpen the merged map?",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if reply == QMessageBox.Yes:
+            self._settle_selection(commit=False)
+            if self.view_model.import_occupancy_grid(out_yaml) is not None:
+                self._on_image_resized()
+
+    def toggle_follow_file(self, checked):
+        # 감시할 파일이 없으면 (프로젝트 등) 체크하지 않음
+        started = self.view_model.set_follow_file(checked)
+        self.follow_file_action.setChecked(started)
+
+    def on_file_reloaded(self, rects):
+        """follow file 로 다시 읽은 결과 반영 (화면 이동/확대 상태는 유지)"""
+        if rects is None:
+            self._on_image_resized()
+            return
+        if not rects:
+            # 픽셀은 그대로지만 YAML(origin 등)이 바뀌었을 수 있음
+            self.canvas.update()
+        for rect in rects:
+            self.canvas.update_image_rect(rect)
+
+    def open_project(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open Project", "", "Map Project (*.mapproj);;All Files (*.*)"
+        )
+        if path:
+            self._settle_selection(commit=False)
+            if self.view_model.open_project(path):
+                self.highlight_action.setChecked(self.view_model.is_highlight_enabled())
+                self.show_origin_action.setChecked(self.view_model.get_show_origin())
+                self.show_coord_action.setChecked(self.view_model.get_show_coords())
+                self._on_image_resized()
+            else:
+                print("Failed to open project.")
+
+    def save_project(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Project", "", "Map Project (*.mapproj)"
+        )
+        if path:
+            self._settle_selection()
+            if not self.view_model.save_project(path):
+                print("Failed to save project.")
+
     def save_file(self):
         path, _ = QFileDialog.getSaveFileName(
             self, "Save Image", "", "PNG (*.png);;PGM (*.pgm);;All Files (*.*)"
         )
         if path:
+            self._settle_selection()
             if not self.view_model.save_image(path):
                 print("Failed to save image.")
 
     # ---------------------------
     #  (C) Edit
     # ---------------------------
+    def on_cut(self):
+        self.canvas.cut_selection()
+
     def on_invert(self):
+        self._settle_selection()
         self.view_model.invert_image()
         self.canvas.update()
 
@@ -231,6 +440,7 @@ class MainWindow(QMainWindow):
         self.canvas.update()
 
     def on_rotate_clockwise(self):
+        self._settle_selection()
         self.view_model.rotate_clockwise()
         img = self.view_model.get_current_image()
         if not img.isNull():
@@ -239,6 +449,7 @@ class MainWindow(QMainWindow):
         self.canvas.update()
 
     def on_rotate_counterclockwise(self):
+        self._settle_selection()
         self.view_model.rotate_counterclockwise()
         img = self.view_model.get_current_image()
         if not img.isNull():
@@ -246,6 +457,103 @@ class MainWindow(QMainWindow):
         self.update_image_info()
         self.canvas.update()
 
+    def on_resample(self):
+        if not self.view_model.is_file_opened():
+            return
+        meta = self.view_model.get_metadata()
+        current = meta.resolution
+        if current is None:
+            current, ok = QInputDialog.getDouble(
+                self, "Resample", "Current resolution (m/px):", 0.05, 0.0001, 100.0, 4
+            )
+            if not ok:
+                return
+        new_res, ok = QInputDialog.getDouble(
+            self, "Resample", "New resolution (m/px):", current, 0.0001, 100.0, 4
+        )
+        if not ok:
+            return
+        self._settle_selection()
+        if self.view_model.resample_to_resolution(new_res, current):
+            self._on_image_resized()
+
+    def on_auto_crop(self):
+        if not self.view_model.is_file_opened():
+            return
+        margin, ok = QInputDialog.getInt(self, "Auto Crop", "Margin (px):", 0, 0, 10000)
+        if not ok:
+            return
+        self._settle_selection()
+        if self.view_model.auto_crop(margin):
+            self._on_image_resized()
+
+    def on_pad(self):
+        if not self.view_model.is_file_opened():
+            return
+        size, ok = QInputDialog.getInt(self, "Pad", "Padding (px):", 10, 1, 10000)
+        if not ok:
+            return
+        self._settle_selection()
+        if self.view_model.pad(size, size, size, size):
+            self._on_image_resized()
+
+    def on_cleanup(self):
+        if not self.view_model.is_file_opened():
+            return
+        ops = ["Erode", "Dilate", "Open", "Close", "Remove Speckles"]
+        op, ok = QInputDialog.getItem(
+            self, "Cleanup Noise", "Operation:", ops, 2, False
+        )
+        if not ok:
+            return
+        names = list(PALETTE_CLASSES)
+        name, ok = QInputDialog.getItem(
+            self, "Cleanup Noise", "Color:", names, 2, False
+        )
+        if not ok:
+            return
+        # 선택 영역이 있으면 그 영역(bounding rect)만
+        rect = self.canvas.selection_bounds()
+        self._settle_selection()
+        if op == "Remove Speckles":
+            size, ok = QInputDialog.getInt(
+                self, "Cleanup Noise", "Minimum size (px):", 4, 1, 100000
+            )
+            if ok:
+                self.view_model.remove_speckles(PALETTE_CLASSES[name], size, rect)
+        else:
+            size, ok = QInputDialog.getInt(
+                self, "Cleanup Noise", "Kernel size (px):", 3, 1, 51
+            )
+            if not ok:
+                return
+            shapes = [shape.capitalize() for shape in KERNEL_SHAPES]
+            shape, ok = QInputDialog.getItem(
+                self, "Cleanup Noise", "Kernel shape:", shapes, 0, False
+            )
+            if ok:
+                self.view_model.apply_morphology(
+                    op.lower(), PALETTE_CLASSES[name], size, shape.lower(), rect
+                )
+        self.canvas.update()
+
+    def _settle_selection(self, commit=True):
+        """
+        이미지 내용/크기를 바꾸는 작업 전에 호출
+        떠 있는 선택 영역은 지금 좌표 기준이므로 먼저 반영(commit=True)하거나 버림
+        """
+        if commit:
+            self.canvas.commit_selection()
+        else:
+            self.canvas.cancel_selection()
+
+    def _on_image_resized(self):
+        img = self.view_model.get_current_image()
+        if not img.isNull():
+            self.canvas.setFixedSize(img.width(), img.height())
+        self.update_image_info()
+        self.canvas.update()
+
     # ---------------------------
     #  (D) UI
     # ---------------------------
@@ -263,7 +571,12 @@ class MainWindow(QMainWindow):
         self.canvas.update()
 
     def on_mode_changed(self):
-        """라디오버튼 3개 중 어떤 것이 체크됐는지 보고 모드 설정"""
+        """모드 라디오버튼 중 어떤 것이 체크됐는지 보고 모드 설정"""
+        self._settle_selection()
+        self.canvas.clear_path()
+        self.view_model.set_select_mode(None)
+        self.view_model.set_path_mode(False)
+        self.view_model.set_lidar_mode(False)
         if self.radio_brush.isChecked():
             self.view_model.set_line_mode(False)
             self.view_model.set_rect_mode(False)
@@ -273,6 +586,23 @@ class MainWindow(QMainWindow):
         elif self.radio_rect.isChecked():
             self.view_model.set_line_mode(False)
             self.view_model.set_rect_mode(True)
+        elif self.radio_select.isChecked() or self.radio_lasso.isChecked():
+            self.view_model.set_line_mode(False)
+            self.view_model.set_rect_mode(False)
+            kind = "rect" if self.radio_select.isChecked() else "lasso"
+            self.view_model.set_select_mode(kind)
+        elif self.radio_path.isChecked():
+            self.view_model.set_line_mode(False)
+            self.view_model.set_rect_mode(False)
+            self.view_model.set_path_mode(True)
+        elif self.radio_lidar.isChecked():
+            # 스캔은 다른 모드에서도 계속 표시 (벽을 고치면서 확인)
+            self.view_model.set_line_mode(False)
+            self.view_model.set_rect_mode(False)
+            self.view_model.set_lidar_mode(True)
+            self.statusBar().showMessage(
+                "Left drag: place pose, Right drag: heading, Esc: clear"
+            )
         # 선/사각형 시작점 초기화
         self.canvas._line_start = None
         self.canvas._rect_start = None
@@ -284,6 +614,18 @@ class MainWindow(QMainWindow):
     def update_pointer_label(self, x: int, y: int, label: str):
         self.pointer_label.setText(f"Pointer: {label}")
 
+    def on_progress(self, done: int, total: int):
+        """
+        맵 전체 연산 진행률 표시
+        연산 중에는 이벤트 루프를 돌리지 않는다 (그리기/타이머가 쓰는 중인 버퍼를
+        건드리지 않도록). 상태바만 바로 다시 그림
+        """
+        if done >= total:
+            self.statusBar().clearMessage()
+        else:
+            self.statusBar().showMessage(f"Processing... {done * 100 // total}%")
+        self.statusBar().repaint()
+
     def update_image_info(self):
         """이미지 크기 라벨 갱신"""
         w, h = self.view_model.get_image_size()
@@ -315,6 +657,7 @@ class MainWindow(QMainWindow):
             self, "Export Inverted PNG", "", "PNG Files (*.png)"
         )
         if path:
+            self._settle_selection()
             success = self.view_model.export_inverted_image(path)
             if not success:
                 print("Failed to export inverted PNG.")
@@ -325,11 +668,72 @@ class MainWindow(QMainWindow):
         )
         if path:
             metadata = self.view_model.get_metadata()
-            metadata.load_from_yaml(path)
+            try:
+                metadata.load_from_yaml(path)
+            except (OSError, MapMetadataError) as e:
+                print(f"Failed to import metadata: {e}")
+                return
             img = self.view_model.get_current_image()
             metadata.set_image_height(img.height())
             self.canvas.update()
 
+    def on_path_settings(self):
+        """로봇 반경 (해상도를 알면 m, 아니면 px) / unknown 통과 여부"""
+        resolution = self.view_model.get_metadata().resolution
+        radius_px = self.view_model.get_robot_radius()
+        if resolution:
+            radius, ok = QInputDialog.getDouble(
+                self,
+                "Path Check",
+                "Robot radius (m):",
+                radius_px * resolution,
+                0.0,
+                100.0,
+                3,
+            )
+            radius_px = radius / resolution
+        else:
+            radius_px, ok = QInputDialog.getDouble(
+                self, "Path Check", "Robot radius (px):", radius_px, 0.0, 1000.0, 1
+            )
+        if not ok:
+            return
+        self.view_model.set_robot_radius(radius_px)
+
+        reply = QMessageBox.question(
+            self,
+            "Path Check",
+            "Allow path through unknown (outside) area?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes if self.view_model.is_allow_unknown() else QMessageBox.No,
+        )
+        self.view_model.set_allow_unknown(reply == QMessageBox.Yes)
+
+    def on_lidar_settings(self):
+        max_range, unit, fov, beams = self.view_model.get_lidar_settings()
+        max_range, ok = QInputDialog.getDouble(
+            self, "Lidar", f"Max range ({unit}):", max_range, 0.1, 100000.0, 2
+        )
+        if not ok:
+            return
+        fov, ok = QInputDialog.getDouble(
+            self, "Lidar", "Field of view (deg):", fov, 1.0, 360.0, 1
+        )
+        if not ok:
+            return
+        beams, ok = QInputDialog.getInt(self, "Lidar", "Beam count:", beams, 1, 10000)
+        if not ok:
+            return
+        self.view_model.set_lidar_settings(max_range, fov, beams)
+        self.canvas.update()
+
+    def on_path_checked(self, path):
+        if path is None:
+            self.statusBar().showMessage("Path: unreachable")
+            return
+        length, unit = self.view_model.path_length(path)
+        self.statusBar().showMessage(f"Path: {length:.2f} {unit}")
+
     def toggle_show_origin(self, checked):
         self.view_model.set_show_origin(checked)
         self.canvas.update()
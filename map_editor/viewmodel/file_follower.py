@@ -0,0 +1,103 @@
+import os
+import threading
+
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+from ..model.image_model import ImageModel
+
+
+class FileFollower(QObject):
+    """
+    SLAM 이 계속 덮어쓰는 맵/YAML 파일을 감시해서 바뀌면 다시 불러옴
+    - 연속 쓰기는 debounce_ms 동안 모아서 한 번만 처리
+    - 파일 읽기/분류는 백그라운드 스레드, 타일 교체는 GUI 스레드에서
+    """
+
+    # 감시 중 여부가 바뀔 때 (감시할 파일이 없거나 사라지면 False)
+    followingChanged = pyqtSignal(bool)
+    # 다시 읽은 내용을 반영하기 직전 (편집 중인 상태를 정리할 기회)
+    aboutToReload = pyqtSignal()
+    # 바뀐 영역 QRect 목록 (크기가 바뀌어 전체 교체된 경우 None)
+    reloaded = pyqtSignal(object)
+    _loaded = pyqtSignal(object, object, object)  # 이미지, 메타데이터, 읽은 source
+
+    def __init__(self, model: ImageModel, debounce_ms=500, parent=None):
+        super().__init__(parent)
+        self._model = model
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._start_reload)
+
+        self._loading = False
+        self._pending = False
+        self._following = False
+        self._loaded.connect(self._on_loaded)
+
+    def is_enabled(self) -> bool:
+        return bool(self._watcher.files())
+
+    def start(self) -> bool:
+        """현재 맵 파일 감시 시작. 감시할 파일이 없으면 (프로젝트 등) False"""
+        self._stop_watching()
+        paths = [p for p in self._model.get_source_paths() if p and os.path.exists(p)]
+        if paths:
+            self._watcher.addPaths(paths)
+        self._update_following()
+        return self.is_enabled()
+
+    def stop(self):
+        self._stop_watching()
+        self._update_following()
+
+    def _stop_watching(self):
+        files = self._watcher.files()
+        if files:
+            self._watcher.removePaths(files)
+        self._debounce.stop()
+        self._pending = False
+
+    def _update_following(self):
+        following = self.is_enabled()
+        if following != self._following:
+            self._following = following
+            self.followingChanged.emit(following)
+
+    def _on_file_changed(self, path: str):
+        # 새 파일로 교체(rename)되는 경우 감시가 풀리므로 다시 등록
+        if path not in self._watcher.files() and os.path.exists(path):
+            self._watcher.addPath(path)
+        self._update_following()
+        if self.is_enabled():
+            self._debounce.start()
+
+    def _start_reload(self):
+        if self._loading:
+            # 읽는 중에 또 바뀌면 끝난 뒤 한 번 더
+            self._pending = True
+            return
+        self._loading = True
+        # 읽는 동안 다른 맵을 열 수 있으므로 어떤 파일을 읽는지 같이 넘김
+        source = self._model.get_source_paths()
+        threading.Thread(target=self._read, args=(source,), daemon=True).start()
+
+    def _read(self, source):
+        try:
+            img, meta = self._model.read_source(source)
+        except Exception as e:  # 쓰는 도중이라 깨진 파일일 수 있음
+            print(f"Failed to reload map: {e}")
+            img, meta = None, None
+        self._loaded.emit(img, meta, source)
+
+    def _on_loaded(self, img, meta, source):
+        self._loading = False
+        current = source == self._model.get_source_paths()
+        if img is not None and current and self.is_enabled():
+            self.aboutToReload.emit()
+            self.reloaded.emit(self._model.apply_reload(img, meta))
+        if self._pending:
+            self._pending = False
+            self._debounce.start()
@@ -1,4 +1,10 @@
+import math
+
 from ..model.image_model import ImageModel
+from ..model.selection import FloatingSelection
+from ..model.path_planning import path_length
+from ..model.lidar import scan_endpoints
+from .file_follower import FileFollower
 from PyQt5.QtGui import QColor, QImage
 
 
@@ -11,9 +17,63 @@ class ImageViewModel:
         # 모드: 브러시 / 선 / 사각형
         self._line_mode = False
         self._rect_mode = False
+        self._select_mode = None  # None / "rect" / "lasso"
+        self._clipboard = None
+
+        # 경로 확인 모드
+        self._path_mode = False
+        self._robot_radius_px = 0.0
+        self._allow_unknown = False
+
+        # 라이다 스캔 미리보기
+        self._lidar_mode = False
+        self._lidar_pose = None  # (x, y, heading[rad]) 픽셀 좌표
+        self._lidar_range_m = 10.0
+        self._lidar_range_px = 200.0  # 해상도를 모를 때 사용
+        self._lidar_fov_deg = 270.0
+        self._lidar_beams = 360
+        self._lidar_cache = (None, None)
+
+        self._file_follower = None
 
     def open_image(self, path: str) -> bool:
-        return self._model.load_image(path)
+        loaded = self._model.load_image(path)
+        self._restart_follow()
+        return loaded
+
+    def import_occupancy_grid(self, yaml_path: str, image_path: str = None):
+        histogram = self._model.import_occupancy_grid(yaml_path, image_path)
+        self._restart_follow()
+        return histogram
+
+    # --- follow file ---
+    def get_file_follower(self) -> FileFollower:
+        if self._file_follower is None:
+            self._file_follower = FileFollower(self._model)
+        return self._file_follower
+
+    def set_follow_file(self, enabled: bool) -> bool:
+        follower = self.get_file_follower()
+        if enabled:
+            return follower.start()
+        follower.stop()
+        return False
+
+    def _restart_follow(self):
+        """다른 파일을 열면 감시 대상도 바꿈"""
+        if self._file_follower is not None and self._file_follower.is_enabled():
+            self._file_follower.start()
+
+    def merge_maps(self, yaml_paths, out_yaml: str, rule="obstacle"):
+        return self._model.merge_maps(yaml_paths, out_yaml, rule)
+
+    def open_project(self, path: str) -> bool:
+        loaded = self._model.load_project(path)
+        self._restart_follow()
+        return loaded
+
+    def save_project(self, path: str) -> bool:
+        return self._model.save_project(path)
 
     def save_image(self, path: str) -> bool:
         return self._model.save_image(path)
@@ -26,15 +86,23 @@ class ImageViewModel:
 
     # --- 브러시, 선, 사각형 ---
     def draw_brush(self, x, y, prev_x=None, prev_y=None):
-        self._model.draw_brush(
+        return self._model.draw_brush(
             x, y, self._draw_color, self._draw_thickness, prev_x, prev_y
         )
 
     def draw_line(self, x1, y1, x2, y2):
-        self._model.draw_line(x1, y1, x2, y2, self._draw_color, self._draw_thickness)
+        return self._model.draw_line(
+            x1, y1, x2, y2, self._draw_color, self._draw_thickness
+        )
+
+    def draw_polyline(self, points):
+        return self._model.draw_polyline(points, self._draw_color, self._draw_thickness)
 
     def fill_rectangle(self, x1, y1, x2, y2):
-        self._model.fill_rect_area(x1, y1, x2, y2, self._draw_color)
+        return self._model.fill_rect_area(x1, y1, x2, y2, self._draw_color)
+
+    def set_progress_callback(self, callback):
+        self._model.set_progress_callback(callback)
 
     # --- Undo ---
     def undo(self):
@@ -47,6 +115,125 @@ class ImageViewModel:
     def rotate_counterclockwise(self):
         self._model.rotate_counterclockwise()
 
+    # --- 해상도 변환 ---
+    def resample_to_resolution(self, new_resolution: float, current_resolution=None):
+        return self._model.resample_to_resolution(new_resolution, current_resolution)
+
+    # --- crop / pad ---
+    def auto_crop(self, margin: int = 0):
+        return self._model.auto_crop(margin)
+
+    def pad(self, left: int, top: int, right: int, bottom: int):
+        return self._model.pad(left, top, right, bottom)
+
+    # --- 형태학 정리 ---
+    def apply_morphology(
+        self, op: str, class_value: int, size=3, shape="square", rect=None
+    ):
+        return self._model.apply_morphology(op, class_value, size, shape, rect)
+
+    def remove_speckles(self, class_value: int, min_pixels: int, rect=None):
+        return self._model.remove_speckles(class_value, min_pixels, rect)
+
+    # --- 경로 확인 ---
+    def set_robot_radius(self, radius_px: float):
+        self._robot_radius_px = max(0.0, float(radius_px))
+
+    def get_robot_radius(self) -> float:
+        return self._robot_radius_px
+
+    def set_allow_unknown(self, enabled: bool):
+        self._allow_unknown = enabled
+
+    def is_allow_unknown(self) -> bool:
+        return self._allow_unknown
+
+    def plan_path(self, start, goal):
+        """픽셀 좌표 두 점 사이 경로 [(x, y), ...] (도달 불가면 None)"""
+        return self._model.plan_path(
+            start, goal, self._robot_radius_px, self._allow_unknown
+        )
+
+    def plan_path_world(self, start_m, goal_m):
+        """실좌표(m) 두 점 사이 경로 (픽셀 좌표 목록). 메타데이터가 없으면 None"""
+        meta = self._model.get_metadata()
+        start = meta.world_to_pixel(*start_m)
+        goal = meta.world_to_pixel(*goal_m)
+        if start is None or goal is None:
+            return None
+        return self.plan_path(start, goal)
+
+    def path_length(self, path):
+        """경로 길이. 해상도를 알면 (값, "m"), 모르면 (값, "px")"""
+        length = path_length(path)
+        resolution = self._model.get_metadata().resolution
+        if resolution:
+            return length * resolution, "m"
+        return length, "px"
+
+    # --- 라이다 스캔 미리보기 ---
+    def set_lidar_settings(self, max_range, fov_deg, beams):
+        """max_range: 해상도를 알면 m, 아니면 px"""
+        if self._model.get_metadata().resolution:
+            self._lidar_range_m = float(max_range)
+        else:
+            self._lidar_range_px = float(max_range)
+        self._lidar_fov_deg = float(fov_deg)
+        self._lidar_beams = int(beams)
+
+    def get_lidar_settings(self):
+        """(최대 거리, 단위, FOV[deg], 빔 수)"""
+        if self._model.get_metadata().resolution:
+            max_range, unit = self._lidar_range_m, "m"
+        else:
+            max_range, unit = self._lidar_range_px, "px"
+        return max_range, unit, self._lidar_fov_deg, self._lidar_beams
+
+    def _lidar_range_in_px(self) -> float:
+        resolution = self._model.get_metadata().resolution
+        if resolution:
+            return self._lidar_range_m / resolution
+        return self._lidar_range_px
+
+    def set_lidar_pose(self, x, y, heading=None):
+        if heading is None:
+            heading = self._lidar_pose[2] if self._lidar_pose else 0.0
+        self._lidar_pose = (float(x), float(y), float(heading))
+
+    def get_lidar_pose(self):
+        return self._lidar_pose
+
+    def clear_lidar_pose(self):
+        self._lidar_pose = None
+
+    def get_lidar_scan(self):
+        """
+        현재 pose 의 스캔 (빔 끝점 (n, 2) [px], hit 여부) 또는 None
+        맵/pose/설정이 그대로면 이전 결과를 그대로 반환
+        """
+        if self._lidar_pose is None:
+            return None
+        max_range = self._lidar_range_in_px()
+        key = (
+            self._model.get_revision(),
+            self._lidar_pose,
+            max_range,
+            self._lidar_fov_deg,
+            self._lidar_beams,
+        )
+        if key != self._lidar_cache[0]:
+            x, y, heading = self._lidar_pose
+            angles, ranges = self._model.simulate_scan(
+                x,
+                y,
+                heading,
+                max_range,
+                math.radians(self._lidar_fov_deg),
+                self._lidar_beams,
+            )
+            self._lidar_cache = (key, scan_endpoints(x, y, angles, ranges, max_range))
+        return self._lidar_cache[1]
+
     # --- 하이라이트 ---
     def set_highlight_enabled(self, enabled: bool):
         self._model.set_highlight_enabled(enabled)
@@ -67,6 +254,50 @@ class ImageViewModel:
     def is_rect_mode(self) -> bool:
         return self._rect_mode
 
+    def set_select_mode(self, kind):
+        self._select_mode = kind
+
+    def get_select_mode(self):
+        return self._select_mode
+
+    def set_path_mode(self, enabled: bool):
+        self._path_mode = enabled
+
+    def is_path_mode(self) -> bool:
+        return self._path_mode
+
+    def set_lidar_mode(self, enabled: bool):
+        self._lidar_mode = enabled
+
+    def is_lidar_mode(self) -> bool:
+        return self._lidar_mode
+
+    # --- 선택 영역 ---
+    def copy_selection(self, rect, polygon=None) -> bool:
+        floating = self._model.copy_selection(rect, polygon)
+        if floating is not None:
+            self._clipboard = floating
+        return floating is not None
+
+    def cut_selection(self, rect, polygon=None):
+        floating = self._model.cut_selection(rect, polygon)
+        if floating is not None:
+            self._clipboard = floating
+        return floating is not None
+
+    def lift_selection(self, rect, polygon=None):
+        return self._model.lift_selection(rect, polygon)
+
+    def paste_selection(self):
+        """클립보드 내용을 복사한 위치에 띄움 (배열은 공유, 위치만 새로)"""
+        clip = self._clipboard
+        if clip is None:
+            return None
+        return FloatingSelection(clip.pixels, clip.mask, clip.x, clip.y)
+
+    def commit_selection(self, floating):
+        return self._model.commit_selection(floating)
+
     # --- 색상, 굵기 ---
     def set_draw_color(self, color: QColor):
         self._draw_color = color
@@ -0,0 +1,56 @@
+import numpy as np
+
+from map_editor.model import merge
+from map_editor.model.image_model import ImageModel
+
+_YAML = "image: {image}\nresolution: 0.05\norigin: [{x}, 0.0, 0.0]\nnegate: 0\n"
+
+
+def _write_map(tmp_path, name, values, x=0.0):
+    h, w = values.shape
+    with open(tmp_path / f"{name}.pgm", "wb") as f:
+        f.write(f"P5\n{w} {h}\n255\n".encode("ascii") + values.tobytes())
+    path = tmp_path / f"{name}.yaml"
+    path.write_text(_YAML.format(image=f"{name}.pgm", x=x))
+    return str(path)
+
+
+def test_binary_pgm_is_classified_by_thresholds(tmp_path):
+    values = np.full((20, 30), 255, dtype=np.uint8)
+    values[5, :] = 0
+    source = merge.MergeSource.from_yaml(_write_map(tmp_path, "a", values))
+
+    assert (source.classes[5] == merge.OCCUPIED).all()
+    assert (np.delete(source.classes, 5, axis=0) == merge.FREE).all()
+
+
+def test_obstacle_rule_keeps_obstacles_from_every_map(tmp_path):
+    a = np.full((10, 10), 254, dtype=np.uint8)
+    a[:, 8] = 0
+    b = np.full((10, 10), 254, dtype=np.uint8)
+    paths = [
+        _write_map(tmp_path, "a", a),
+        _write_map(tmp_path, "b", b, x=0.25),
+    ]
+    out = str(tmp_path / "out.yaml")
+
+    meta = merge.merge_maps(paths, out, "obstacle")
+
+    with open(meta.image_path, "rb") as f:
+        data = f.read()
+    pixels = np.frombuffer(data[-10 * 15 :], dtype=np.uint8).reshape(10, 15)
+    assert (pixels[:, 8] == 0).all()
+    assert (pixels[:, 14] == 254).all()
+
+
+def test_broken_yaml_fails_without_raising(tmp_path):
+    good = _write_map(tmp_path, "a", np.full((4, 4), 254, dtype=np.uint8))
+    broken = tmp_path / "broken.yaml"
+    broken.write_text("image: [a.pgm\nresolution: 0.05\n")
+    scalar = tmp_path / "scalar.yaml"
+    scalar.write_text("just a string\n")
+
+    model = ImageModel()
+    for path in (broken, scalar):
+        assert model.merge_maps([good, str(path)], str(tmp_path / "out.yaml")) is None
+        assert model.import_occupancy_grid(str(path)) is None
@@ -0,0 +1,62 @@
+import numpy as np
+from PyQt5.QtCore import QRect
+
+from map_editor.model import morphology, palette
+from map_editor.model.image_model import ImageModel
+from map_editor.model.pixel_buffer import image_view, new_image
+
+
+def _model(tmp_path, pixels):
+    h, w = pixels.shape
+    img = new_image(w, h)
+    image_view(img)[:] = pixels
+    path = str(tmp_path / "map.png")
+    assert img.save(path)
+    model = ImageModel()
+    assert model.load_image(path)
+    return model
+
+
+def _pixels(model):
+    return image_view(model.get_current_image()).copy()
+
+
+def test_remove_speckles_keeps_components_crossing_the_rect(tmp_path):
+    pixels = np.full((100, 100), palette.INSIDE, dtype=np.uint32)
+    pixels[50, :] = palette.BOUNDARY
+    pixels[47, 2] = palette.BOUNDARY  # rect 안에 완전히 들어있는 점
+    model = _model(tmp_path, pixels)
+
+    model.remove_speckles(palette.BOUNDARY, 10, QRect(0, 45, 5, 10))
+
+    result = _pixels(model)
+    assert (result[50, :] == palette.BOUNDARY).all()
+    assert result[47, 2] == palette.INSIDE
+
+
+def test_remove_speckles_inner_region():
+    pixels = np.full((10, 10), palette.INSIDE, dtype=np.uint32)
+    pixels[0, 0] = palette.BOUNDARY  # inner 밖과 이어진 점
+    pixels[5, 5] = palette.BOUNDARY
+    inner = (slice(1, 9), slice(1, 9))
+
+    result = morphology.remove_speckles(pixels, palette.BOUNDARY, 2, inner)
+
+    assert result[0, 0] == palette.BOUNDARY
+    assert result[5, 5] == palette.INSIDE
+
+
+def test_morphology_kernel_larger_than_map():
+    pixels = np.full((3, 10), palette.INSIDE, dtype=np.uint32)
+    pixels[1, 4] = palette.BOUNDARY
+
+    dilated = morphology.apply_class_morphology(pixels, "dilate", palette.BOUNDARY, 9)
+    assert (dilated[:, 0:9] == palette.BOUNDARY).all()
+    assert (dilated[:, 9] == palette.INSIDE).all()
+
+    for shape in morphology.KERNEL_SHAPES:
+        for op in morphology.OPERATIONS:
+            out = morphology.apply_class_morphology(
+                pixels[:2], op, palette.BOUNDARY, 51, shape
+            )
+            assert out.shape == (2, 10)
@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+import pytest
+from PyQt5.QtCore import QRect
+
+from map_editor.model import palette
+from map_editor.model.image_model import ImageModel
+from map_editor.model.pixel_buffer import image_view
+from map_editor.model.project_file import (
+    ProjectFormatError,
+    ProjectReader,
+    save_project,
+)
+
+
+def _map(h=70, w=90):
+    rng = np.random.default_rng(0)
+    pixels = rng.choice(np.array(palette.PALETTE, dtype=np.uint32), (h, w))
+    pixels[10:20, 30:40] = 0xFF123456  # 팔레트 밖 색
+    return pixels
+
+
+def test_round_trip_tiles_region_and_history(tmp_path):
+    path = str(tmp_path / "map.mapproj")
+    pixels = _map()
+    history = [
+        ([[1.0, 2.0, 0.0], 0.05, 70], True, [(0, 0, _map()[::-1].copy())]),
+        (None, False, [(3, 4, pixels[4:9, 3:20].copy()), (50, 60, pixels[:2, :3])]),
+    ]
+    save_project(
+        path,
+        pixels,
+        metadata_yaml="resolution: 0.05\n",
+        overlays={"highlight": True},
+        history=history,
+        tile_size=32,
+    )
+
+    with ProjectReader(path) as reader:
+        assert (reader.width, reader.height, reader.tile_size) == (90, 70, 32)
+        assert reader.metadata_yaml == "resolution: 0.05\n"
+        assert reader.overlays == {"highlight": True}
+        np.testing.assert_array_equal(reader.read_region(0, 0, 90, 70), pixels)
+        # 여러 타일에 걸친 일부 영역
+        np.testing.assert_array_equal(
+            reader.read_region(25, 30, 40, 35), pixels[30:65, 25:65]
+        )
+        np.testing.assert_array_equal(reader.read_tile(2, 2), pixels[64:, 64:])
+
+        restored = reader.read_history()
+    assert len(restored) == len(history)
+    for (meta, full, patches), (exp_meta, exp_full, exp_patches) in zip(
+        restored, history
+    ):
+        assert meta == (tuple(exp_meta) if exp_meta else None)
+        assert full == exp_full
+        assert [(x, y) for x, y, _ in patches] == [(x, y) for x, y, _ in exp_patches]
+        for (_, _, got), (_, _, expected) in zip(patches, exp_patches):
+            np.testing.assert_array_equal(got, expected)
+
+
+def test_corrupted_block_is_a_format_error(tmp_path):
+    path = str(tmp_path / "map.mapproj")
+    save_project(path, _map(), tile_size=32)
+    with open(path, "r+b") as f:
+        f.seek(20)
+        f.write(b"\0" * 100)
+
+    with ProjectReader(path) as reader:
+        with pytest.raises(ProjectFormatError):
+            reader.read_region(0, 0, reader.width, reader.height)
+    assert not ImageModel().load_project(path)
+
+
+def test_corrupted_footer_is_a_format_error(tmp_path):
+    path = str(tmp_path / "map.mapproj")
+    save_project(path, _map(), tile_size=32)
+    with ProjectReader(path) as reader:
+        footer_offset = reader._tiles[-1][0] + reader._tiles[-1][1]
+    with open(path, "r+b") as f:
+        f.seek(footer_offset + 5)
+        f.write(b"\xff" * 10)
+
+    with pytest.raises(ProjectFormatError):
+        ProjectReader(path)
+    assert not ImageModel().load_project(path)
+
+
+def test_failed_save_keeps_existing_file(tmp_path):
+    path = str(tmp_path / "map.mapproj")
+    save_project(path, _map(), tile_size=32)
+    before = open(path, "rb").read()
+
+    too_many = np.arange(300 * 300, dtype=np.uint32).reshape(300, 300)
+    with pytest.raises(ProjectFormatError):
+        save_project(path, too_many)
+
+    assert open(path, "rb").read() == before
+    assert os.listdir(tmp_path) == ["map.mapproj"]
+
+
+def test_load_project_region(tmp_path):
+    path = str(tmp_path / "map.mapproj")
+    pixels = _map()
+    save_project(path, pixels, metadata_yaml="resolution: 0.05\n", tile_size=32)
+
+    model = ImageModel()
+    assert model.load_project(path, QRect(10, 20, 30, 25))
+    np.testing.assert_array_equal(
+        image_view(model.get_current_image()), pixels[20:45, 10:40]
+    )
@@ -0,0 +1,69 @@
+import os
+import threading
+
+from map_editor.service.tile_cache import TileCache
+
+
+def _keep_level1(key):
+    return key[1] == "tile" and key[3] == 1
+
+
+def test_migrate_moves_kept_tiles_and_drops_the_rest(tmp_path):
+    cache = TileCache(str(tmp_path))
+    cache.put(("old", "tile", 0, 1, 2, 3), b"kept")
+    cache.put(("old", "tile", 0, 0, 2, 3), b"dropped")
+    cache.put(("old", "thumb", 0, 256), b"thumb")
+
+    cache.migrate("old", "new", _keep_level1)
+
+    assert cache.get(("new", "tile", 0, 1, 2, 3)) == b"kept"
+    assert cache.get(("new", "tile", 0, 0, 2, 3)) is None
+    assert cache.get(("old", "tile", 0, 1, 2, 3)) is None
+    assert os.listdir(tmp_path) == ["new"]
+    assert os.listdir(tmp_path / "new") == ["tile_0_1_2_3.png"]
+
+    # 새 캐시로 다시 열어도 디스크에서 읽힘
+    assert TileCache(str(tmp_path)).get(("new", "tile", 0, 1, 2, 3)) == b"kept"
+
+
+def test_late_put_for_retired_hash_is_dropped(tmp_path):
+    cache = TileCache(str(tmp_path))
+    cache.put(("old", "tile", 0, 0, 0, 0), b"a")
+    cache.migrate("old", "new", _keep_level1)
+
+    cache.put(("old", "tile", 0, 0, 1, 1), b"late")
+
+    assert cache.get(("old", "tile", 0, 0, 1, 1)) is None
+    assert not os.path.exists(tmp_path / "old")
+
+    # 예전 내용으로 되돌아오면 다시 쓸 수 있음
+    cache.migrate("new", "old", _keep_level1)
+    cache.put(("old", "tile", 0, 0, 1, 1), b"again")
+    assert cache.get(("old", "tile", 0, 0, 1, 1)) == b"again"
+
+
+def test_migrate_while_other_threads_put(tmp_path):
+    cache = TileCache(str(tmp_path), max_memory_items=8)
+    errors = []
+    hashes = [f"h{i}" for i in range(20)]
+    current = [hashes[0]]
+
+    def writer(wid):
+        try:
+            for i in range(300):
+                cache.put((current[0], "tile", 0, 1, wid, i % 7), b"x" * 64)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for old, new in zip(hashes, hashes[1:]):
+        current[0] = new
+        cache.migrate(old, new, _keep_level1)
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert os.listdir(tmp_path) == [hashes[-1]]
+    assert not [n for n in os.listdir(tmp_path / hashes[-1]) if n.endswith(".tmp")]